@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+import numpy as np
+from constants import ANIMATIONCAPACITY
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class Clip:
+    """An animation clip: the frames of a row of all_images of a sprite.
+        duration: how long each frame is shown(ms), one number or a list with one per frame
+        loop: if the clip starts over after the last frame
+        events: {frame index: functions called with the sprite when the frame is shown}
+        end: functions called with the sprite when the last frame of a clip that doesn't loop is over"""
+
+    def __init__(self, row, duration=50, loop=True, events=None, end=()) -> None:
+        self.row = row
+        self.duration = duration
+        self.loop = loop
+        self.events = events or {}
+        self.end = end
+
+    def duration_of(self, index):
+        return self.duration if isinstance(self.duration, int) else self.duration[index]
+
+
+class Animation:
+    """The clip a sprite is playing. The animator steps it.
+       sprite.clip_name() is asked for the clip to show on every step, so the sprites only
+       describe which clip belongs to their state."""
+
+    def __init__(self, sprite, clips, slot) -> None:
+        self.sprite = sprite
+        self.clips = clips
+        self.slot = slot
+        self.name = None
+        self.clip = None
+        self.index = 0  # the next frame to show
+        self.finished = False
+
+    def play(self, name):
+        """Start the clip unless it's being played. A finished clip starts over."""
+        if name != self.name or self.finished:
+            self.name = name
+            self.clip = self.clips[name]
+            self.index = 0
+            self.finished = False
+
+    def step(self):
+        """Show the next frame and call its events. Return how long the frame is shown."""
+        clip = self.clip
+        sprite = self.sprite
+        frames = sprite.all_images[clip.row]
+        if self.index >= len(frames):
+            if not clip.loop:
+                # the end of the clip
+                self.finished = True
+                for event in clip.end:
+                    event(sprite)
+                return clip.duration_of(len(frames) - 1)
+            self.index = 0
+        index = self.index
+        sprite.image = frames[index]
+        for event in clip.events.get(index, ()):
+            event(sprite)
+        self.index += 1
+        return clip.duration_of(index)
+
+
+class Animator:
+    """The animations of a scene, stepped by the scene clock in one pass.
+       An animation is due when the frame it shows has been shown for longer than its duration."""
+
+    def __init__(self, capacity=ANIMATIONCAPACITY) -> None:
+        self.capacity = capacity
+        self.used = np.zeros(capacity, dtype=bool)
+        self.last_update = np.zeros(capacity)  # the time of the last step(ms)
+        self.duration = np.zeros(capacity)  # the duration of the shown frame
+        self.animations = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def add(self, sprite, clips):
+        """Animate the sprite with the clips. Return the animation."""
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.used[slot] = True
+        self.last_update[slot] = 0
+        self.duration[slot] = 0
+        animation = Animation(sprite, clips, slot)
+        self.animations[slot] = animation
+        return animation
+
+    def remove(self, animation):
+        """Stop the animation. Removing a removed animation does nothing."""
+        slot = animation.slot
+        if self.animations[slot] is animation:
+            self.used[slot] = False
+            self.animations[slot] = None
+            self.free.append(slot)
+
+    def grow(self):
+        """Double the capacity."""
+        old = self.capacity
+        self.capacity *= 2
+        for name in ('used', 'last_update', 'duration'):
+            array = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.animations += [None] * old
+        self.free = list(range(self.capacity - 1, old - 1, -1)) + self.free
+
+    def update(self, now):
+        """Step the due animations. now is the time of the scene clock(ms)."""
+        due = np.flatnonzero(self.used & (now - self.last_update > self.duration))
+        animations = self.animations
+        for slot in due.tolist():
+            animation = animations[slot]
+            animation.play(animation.sprite.clip_name())
+            self.duration[slot] = animation.step()
+        self.last_update[due] = now
+
+    def __len__(self):
+        return int(self.used.sum())
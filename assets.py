@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+import pygame as pg
+from collections import OrderedDict
+from constants import ASSETCACHEBUDGET, TEXTCACHESIZE
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class AssetCache:
+    """A process-wide image cache.
+       Images are keyed by (path, size, flip, colorkey, alpha) and stored scaled and converted
+       to the display format. The least recently used images are evicted when the cache is
+       larger than the budget(bytes)."""
+
+    def __init__(self, budget=ASSETCACHEBUDGET) -> None:
+        self.budget = budget
+        self.images = OrderedDict()  # key: surface
+        self.memory = 0  # the bytes used by the cached surfaces
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def image(self, path, size=None, flip=False, colorkey=None, alpha=None):
+        """Get the image of the path.
+            size: the size to scale the image to
+            flip: flip the image horizontally
+            colorkey: the colorkey of the image
+            alpha: True keeps per pixel alpha, False drops it, None keeps what the file has."""
+        key = (path, size, flip, colorkey, alpha)
+        surf = self.images.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.load_image(path, size, flip, colorkey, alpha)
+        self.images[key] = surf
+        self.memory += self.surface_memory(surf)
+        self.evict()
+        return surf
+
+    def load_image(self, path, size, flip, colorkey, alpha):
+        """Decode, scale and convert the image."""
+        surf = pg.image.load(path)
+        if alpha is None:
+            alpha = bool(surf.get_flags() & pg.SRCALPHA)
+        if size is not None:
+            surf = pg.transform.scale(surf, size)
+        if flip:
+            surf = pg.transform.flip(surf, True, False)
+        if alpha:
+            surf = surf.convert_alpha()
+        else:
+            surf = surf.convert()
+        if colorkey is not None:
+            surf.set_colorkey(colorkey)
+        return surf
+
+    def surface_memory(self, surf):
+        return surf.get_pitch() * surf.get_height()
+
+    def evict(self):
+        """Remove the least recently used images until the cache fits the budget.
+            The latest image is always kept."""
+        while self.memory > self.budget and len(self.images) > 1:
+            _, surf = self.images.popitem(last=False)
+            self.memory -= self.surface_memory(surf)
+            self.evictions += 1
+
+    def hit_rate(self):
+        if self.hits + self.misses == 0:
+            return 0
+        return self.hits / (self.hits + self.misses)
+
+    def clear(self):
+        self.images.clear()
+        self.memory = 0
+
+
+class FontCache:
+    """Font objects keyed by (path, size) and rendered text keyed by (font, text, color, antialias).
+       At most `capacity` rendered text surfaces are kept. The least recently used is dropped first."""
+
+    def __init__(self, capacity=TEXTCACHESIZE) -> None:
+        self.capacity = capacity
+        self.fonts = {}  # (path, size): font
+        self.texts = OrderedDict()  # (path, size, text, color, antialias): surface
+        # counters
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, path, size):
+        """Get the font of the path and size. The TTF file is only parsed the first time."""
+        font = self.fonts.get((path, size))
+        if font is None:
+            font = pg.font.Font(path, size)
+            self.fonts[(path, size)] = font
+        return font
+
+    def render(self, path, size, text, color, antialias=True):
+        """Get the rendered text surface. The surface is shared, so it must not be changed."""
+        key = (path, size, text, tuple(color), antialias)
+        surf = self.texts.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.texts.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.font(path, size).render(text, antialias, color)
+        self.texts[key] = surf
+        if len(self.texts) > self.capacity:
+            self.texts.popitem(last=False)
+        return surf
+
+    def hit_rate(self):
+        if self.hits + self.misses == 0:
+            return 0
+        return self.hits / (self.hits + self.misses)
+
+
+assets = AssetCache()
+fonts = FontCache()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 import pygame as pg
 from constants import BLACK, SCREENHEIGHT, SCREENWIDTH
+from assets import assets
 
 
 __author__ = 'Geoff Yulong Li'
@@ -13,14 +14,13 @@ class Background:
         self.camera = camera
         self.vel_multiplier = vel_multiplier
         self.scale_multiplier = scale_multiplier
-        # if convert arg is True, convert image surface.
+        # if convert arg is True, drop the alpha of the image surface.
         if len(convert) != 0 and convert[0]:
-            self.image = pg.image.load(image).convert()
+            alpha = False
         else:
-            self.image = pg.image.load(image)
-        self.image.set_colorkey(BLACK)
-        self.surf = pg.transform.scale(
-            self.image, (int(self.scale_multiplier[0] * SCREENWIDTH), int(self.scale_multiplier[1] * SCREENHEIGHT)))
+            alpha = None
+        self.surf = assets.image(image, (int(self.scale_multiplier[0] * SCREENWIDTH), int(
+            self.scale_multiplier[1] * SCREENHEIGHT)), colorkey=BLACK, alpha=alpha)
         self.rect = self.surf.get_rect(
             topleft=(self.pos[0] * SCREENWIDTH, self.pos[1] * SCREENHEIGHT))
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+import pygame as pg
+from constants import *
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# the top left corners of the spin frames in the fire ball sheet
+FIREBALLSPINFRAMES = [(94, 95), (816, 94), (1478, 110), (2215, 111), (2849, 101)]
+FIREBALLSHEETFRAMESIZE = 305
+
+
+def bake_fire_ball():
+    """Cut the spin frames from the fire ball sheet, scale them to the size of the fire ball
+        and save them side by side as one strip. The game loads the strip instead of the 3500px sheet."""
+    sheet = pg.image.load(FIREBALL)
+    strip = pg.Surface((FIREBALLSIZE * len(FIREBALLSPINFRAMES), FIREBALLSIZE))
+    frame = pg.Surface((FIREBALLSHEETFRAMESIZE, FIREBALLSHEETFRAMESIZE))
+    for i, (x, y) in enumerate(FIREBALLSPINFRAMES):
+        frame.fill(BLACK)
+        frame.blit(sheet, (0, 0), (x, y, FIREBALLSHEETFRAMESIZE,
+                   FIREBALLSHEETFRAMESIZE))
+        strip.blit(pg.transform.scale(
+            frame, (FIREBALLSIZE, FIREBALLSIZE)), (i * FIREBALLSIZE, 0))
+    pg.image.save(strip, FIREBALLFRAMES)
+
+
+if __name__ == '__main__':
+    # Bake the frames again after changing the sprite sheets.
+    bake_fire_ball()
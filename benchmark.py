@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+import argparse
+import random
+import subprocess
+import time
+import pygame as pg
+import constants as c
+from controllers import KeyboardController, BotController
+from stats import summarize, save_json
+from tools import SCENES, LEVELS, headless_control
+
+
+__author__ = 'Geoff Yulong Li'
+
+# the methods of a scene timed by the benchmark
+PHASES = ('event_loop', 'update', 'draw_components', 'scale_screen')
+
+
+class ScriptedKeys:
+    """The keyboard of a benchmark run. pg.key.get_pressed is replaced by the keys of the frame.
+       The player walks right and left in turns of 2 sec, jumps every 0.75 sec, attacks every
+       1/3 sec and throws a fire ball every sec."""
+
+    def __init__(self) -> None:
+        self.frame = 0
+        self.pressed = set()
+
+    def next_frame(self, frame):
+        self.frame = frame
+        self.pressed = {pg.K_d if (frame // 120) % 2 == 0 else pg.K_a}
+        if frame % 45 == 0:
+            self.pressed.add(pg.K_k)
+        if frame % 20 == 0:
+            self.pressed.add(pg.K_j)
+        # The fire ball is thrown by the events of the l key.
+        if frame % 60 == 10:
+            pg.event.post(pg.event.Event(pg.KEYDOWN, key=pg.K_l, mod=0, unicode='l', scancode=0))
+        elif frame % 60 == 25:
+            pg.event.post(pg.event.Event(pg.KEYUP, key=pg.K_l, mod=0, unicode='l', scancode=0))
+
+    def get_pressed(self):
+        return self
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class PhaseTimer:
+    """The time spent in the phases of a scene, summed over each frame(ms).
+       The simulation runs several steps a frame, so a phase may be called more than once a frame."""
+
+    def __init__(self, scene, phases) -> None:
+        self.phases = phases
+        self.current = dict.fromkeys(phases, 0.0)
+        self.samples = {phase: [] for phase in phases}
+        for phase in phases:
+            setattr(scene, phase, self.timed(phase, getattr(scene, phase)))
+
+    def timed(self, phase, method):
+        def wrapper(*args, **kwargs):
+            begin = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.current[phase] += (time.perf_counter() - begin) * 1000
+            return result
+        return wrapper
+
+    def end_frame(self, record):
+        for phase in self.phases:
+            if record:
+                self.samples[phase].append(self.current[phase])
+            self.current[phase] = 0.0
+
+
+def new_scene(control, name, seed):
+    """Create the scene like the game does, without its fade in and main loop."""
+    glo = control.glo
+    glo.next_scene = [name, 'player01']
+    scene_class, map_path = SCENES[name]
+    random.seed(seed)
+    scene = scene_class(control.clock, control.screen, glo.display, glo, 1.5)
+    scene.load_data(map_path)
+    scene.new()
+    scene.particles.seed(seed)
+    return scene
+
+
+def run_scene(control, name, frames, warmup, seed, bot=False):
+    """Run the scene for warmup + frames frames of 1/60 sec. Return the statistics of the frames.
+        The player is played by the scripted keys, or by the bot player with bot."""
+    control.glo.controller = BotController if bot else KeyboardController
+    scene = new_scene(control, name, seed)
+    # The selection boxes after death wait for the keyboard, so the player can't die.
+    scene.player.hv = 10 ** 6
+    keys = ScriptedKeys()
+    timer = PhaseTimer(scene, PHASES)
+    frame_times = []
+    frame_time = 1 / 60
+    get_pressed = pg.key.get_pressed
+    pg.key.get_pressed = keys.get_pressed
+    try:
+        for frame in range(warmup + frames):
+            if not bot:
+                keys.next_frame(frame)
+            if name == 'infinite_mode_cliff' and not scene.game_begin:
+                # Start the waves right away.
+                scene.player.rect.center = scene.enter_rects['game_begin'].center
+            begin = time.perf_counter()
+            scene.simulate(frame_time)
+            scene.update_view(frame_time)
+            scene.draw()
+            scene.flip()
+            record = frame >= warmup
+            if record:
+                frame_times.append((time.perf_counter() - begin) * 1000)
+            timer.end_frame(record)
+            if scene.next_scene is not None:
+                break
+    finally:
+        pg.key.get_pressed = get_pressed
+    result = {'frame': summarize(frame_times)}
+    result.update({phase: summarize(timer.samples[phase]) for phase in PHASES})
+    result['enemies'] = len(scene.enemies)
+    return result
+
+
+def get_commit():
+    """Return the commit of the game, or None out of a git repository."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results):
+    print('%-22s %-16s %9s %9s %9s' % ('scene', 'phase', 'p50', 'p95', 'p99'))
+    for name, result in results.items():
+        for phase in ('frame',) + PHASES:
+            summary = result[phase]
+            print('%-22s %-16s %9.3f %9.3f %9.3f' % (
+                name, phase, summary['p50'], summary['p95'], summary['p99']))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Run the scenes headless and time their frames.')
+    parser.add_argument('--frames', type=int, default=c.BENCHMARKFRAMES,
+                        help='the frames timed in each scene')
+    parser.add_argument('--warmup', type=int, default=c.BENCHMARKWARMUP,
+                        help='the frames run before the timing starts')
+    parser.add_argument('--scenes', nargs='+', choices=LEVELS, default=list(LEVELS),
+                        help='the scenes to run')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='the seed of the random spawns and particles')
+    parser.add_argument('--bot', action='store_true',
+                        help='let the bot player play instead of the scripted keys')
+    parser.add_argument('--out', default=c.BENCHMARKPATH,
+                        help='where the results are saved')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    control = headless_control()
+    results = {name: run_scene(control, name, args.frames, args.warmup, args.seed, args.bot)
+               for name in args.scenes}
+    print_report(results)
+    save_json(args.out, {'commit': get_commit(), 'frames': args.frames, 'warmup': args.warmup,
+                         'seed': args.seed, 'bot': args.bot, 'simulation_rate': c.SIMULATIONRATE,
+                         'scenes': results})
+    pg.quit()
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import pygame as pg
 import constants as c
+from assets import fonts
+from sounds import sounds
 
 
 __author__ = 'Geoff Yulong Li'
@@ -34,27 +36,23 @@ class Button(pg.sprite.Sprite):
         self.top_rect = pg.Rect(self.initial_pos, size)
         self.bottom_rect = pg.Rect(
             (self.initial_pos[0], self.initial_pos[1] + self.elevation), size)
-        self.text_surf = pg.font.Font(
-            font, font_size).render(text, True, c.WHITE)
+        self.text_surf = fonts.render(font, font_size, text, c.WHITE)
         self.text_rect = self.text_surf.get_rect(center=self.top_rect.center)
         # collide rect
         self.collide_rect = pg.Rect((self.bottom_rect.x, self.bottom_rect.y -
                                     self.elevation), (self.bottom_rect.width, self.bottom_rect.height))
         # confirm sound
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
 
     def update_text(self, text):
         # Update text.
-        self.text_surf = pg.font.Font(
-            self.font, self.font_size).render(text, True,  c.WHITE)
+        self.text_surf = fonts.render(
+            self.font, self.font_size, text, c.WHITE)
         self.text_rect = self.text_surf.get_rect(topleft=self.initial_pos)
 
     def update(self, *text):
         """Update the pos of the top rect and text."""
         self.move()
-        # Update the confirm sound volume.
-        self.confirm_sound.set_volume(c.sound_volume)
         self.top_rect.topleft = (
             self.initial_pos[0], self.initial_pos[1] + self.dynamic_elevation)
         self.bottom_rect.topleft = (
@@ -111,8 +109,7 @@ class Text(pg.sprite.Sprite):
         self.font = font
         self.color = color
         self.font_size = font_size
-        self.text_surf = pg.font.Font(
-            font, font_size).render(text, True, color)
+        self.text_surf = fonts.render(font, font_size, text, color)
         self.text_rect = self.text_surf.get_rect(topleft=initial_pos)
         self.initial_pos = [initial_pos[0], initial_pos[1]]
         self.pos = pos
@@ -121,8 +118,8 @@ class Text(pg.sprite.Sprite):
         """Update the pos of the top rect and text."""
         self.move()
         if len(text) != 0:
-            self.text_surf = pg.font.Font(
-                self.font, self.font_size).render(str(text[0]), True, self.color)
+            self.text_surf = fonts.render(
+                self.font, self.font_size, str(text[0]), self.color)
             self.text_rect = self.text_surf.get_rect(topleft=self.initial_pos)
         self.text_rect.topleft = self.initial_pos
 
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import constants as c
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class SimClock:
+    """The clock of a simulation that runs in fixed steps of dt(s).
+       The time of each frame is added to it and as many steps are taken as the time covers.
+       It never reads the wall clock, so a scene can be stepped faster or slower than realtime."""
+
+    def __init__(self, rate=None) -> None:
+        self.dt = 1 / (rate or c.SIMULATIONRATE)  # the time of a step(s)
+        self.ticks = 0  # the simulated time(ms)
+        self.steps = 0  # the amount of steps taken
+        self.accumulator = 0  # the time waiting to be simulated(s)
+        self.alpha = 1  # how far the rendered frame is between the last two steps(0 to 1)
+
+    def add_frame(self, frame_time):
+        """Add the time of a frame(s) to simulate. A long frame is cut to MAXFRAMETIME."""
+        self.accumulator += min(frame_time, c.MAXFRAMETIME)
+
+    def due(self):
+        """Return if a step is waiting to be simulated."""
+        return self.accumulator >= self.dt
+
+    def step(self):
+        """Take a step. Return the simulated time(ms)."""
+        self.ticks += self.dt * 1000
+        self.accumulator -= self.dt
+        self.steps += 1
+        return self.ticks
+
+    def end_frame(self):
+        """The rest of the time is kept for the next frame. The frame is drawn that far past
+            the last step."""
+        self.alpha = min(self.accumulator / self.dt, 1)
+
+
+class RealtimeClock:
+    """Frames paced by the wall clock, at most fps a second."""
+
+    def __init__(self, clock, fps=c.FPS) -> None:
+        self.clock = clock  # pg.time.Clock
+        self.fps = fps
+
+    def tick(self):
+        """Wait for the next frame. Return the time of the frame(s)."""
+        return self.clock.tick(self.fps) / 1000
+
+
+class VirtualClock:
+    """Frames of a fixed time that never wait, so a scene runs as fast as the CPU allows."""
+
+    def __init__(self, frame_time=1 / c.FPS) -> None:
+        self.frame_time = frame_time
+        self.frames = 0
+
+    def tick(self):
+        self.frames += 1
+        return self.frame_time
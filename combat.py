@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+from constants import COMBATCELLSIZE
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# combat event kinds, in the order they are resolved for each enemy
+FIREBALLHIT = 0  # A fire ball hits the body of the enemy.
+PLAYERSLASH = 1  # The attack rect of the player hits the body of the enemy.
+BODYCOLLISION = 2  # The body of the player collides with the body of the enemy.
+ENEMYSLASH = 3  # The attack rect of the enemy hits the body of the player.
+
+
+class SpatialHash:
+    """Items bucketed by the cells their rects overlap. It is cleared and filled again every frame."""
+
+    def __init__(self, cell_size=COMBATCELLSIZE) -> None:
+        self.cell_size = cell_size
+        self.cells = {}  # (col, row): [(rect, item)]
+        self.tests = 0  # the amount of rects tested by query() so far
+
+    def clear(self):
+        self.cells.clear()
+
+    def cells_of(self, rect):
+        cs = self.cell_size
+        for row in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for col in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                yield col, row
+
+    def insert(self, rect, item):
+        cs = self.cell_size
+        cells = self.cells
+        left, top = rect.left // cs, rect.top // cs
+        right, bottom = (rect.right - 1) // cs, (rect.bottom - 1) // cs
+        # Most rects are smaller than a cell, so try the single cell case first.
+        if left == right and top == bottom:
+            cells.setdefault((left, top), []).append((rect, item))
+            return
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                cells.setdefault((col, row), []).append((rect, item))
+
+    def query(self, rect):
+        """Get the items whose rects overlap the rect. Each item is returned once."""
+        found = []
+        seen = set()
+        cells = self.cells
+        for cell in self.cells_of(rect):
+            bucket = cells.get(cell, ())
+            self.tests += len(bucket)
+            for other, item in bucket:
+                if id(item) not in seen and rect.colliderect(other):
+                    seen.add(id(item))
+                    found.append(item)
+        return found
+
+
+class CombatResolver:
+    """The broadphase of the combat between the player, the enemies and the fire balls.
+       The body rects and attack rects of the enemies are bucketed in spatial hashes every frame,
+       so the player and each fire ball are only tested against the enemies around them.
+       The hits are reported as events (kind, enemy, fire ball or None), sorted by the order of
+       the enemies, the kind and the order of the fire balls. This is the order the scene used to
+       test them in, enemy by enemy."""
+
+    def __init__(self, cell_size=COMBATCELLSIZE) -> None:
+        self.bodies = SpatialHash(cell_size)
+        self.attacks = SpatialHash(cell_size)
+        self.events = []
+
+    def resolve(self, player, enemies, fire_balls):
+        """Get the combat events of this frame."""
+        self.bodies.clear()
+        self.attacks.clear()
+        order = {}  # enemy: index
+        for i, enemy in enumerate(enemies):
+            order[enemy] = i
+            self.bodies.insert(enemy.body_rect, enemy)
+            if enemy.attack_rect is not None:
+                self.attacks.insert(enemy.attack_rect, enemy)
+        events = []
+        if order:
+            for j, fire_ball in enumerate(fire_balls):
+                for enemy in self.bodies.query(fire_ball.rect):
+                    events.append((order[enemy], FIREBALLHIT, j, enemy, fire_ball))
+            if player.attack_rect is not None:
+                for enemy in self.bodies.query(player.attack_rect):
+                    events.append((order[enemy], PLAYERSLASH, 0, enemy, None))
+            for enemy in self.bodies.query(player.body_rect):
+                events.append((order[enemy], BODYCOLLISION, 0, enemy, None))
+            for enemy in self.attacks.query(player.body_rect):
+                events.append((order[enemy], ENEMYSLASH, 0, enemy, None))
+        events.sort(key=lambda event: event[:3])
+        self.events = [(kind, enemy, fire_ball)
+                       for _, kind, _, enemy, fire_ball in events]
+        return self.events
+
+    def tests(self):
+        """Get the amount of rect tests so far."""
+        return self.bodies.tests + self.attacks.tests
@@ -15,13 +15,82 @@ from pygame.locals import (
 __author__ = 'Geoff Yulong Li'
 
 
-# FPS
+# FPS (the most frames rendered a second)
 FPS = 60
+# the simulation steps a second. The simulation runs at this fixed rate whatever the FPS is.
+SIMULATIONRATE = 120
+# the most time simulated in one frame (s). A slower frame slows the game down instead of freezing it.
+MAXFRAMETIME = 0.1
 # caption
 TITLE = 'The Knight'
 # screen size
 SCREENWIDTH = 640
 SCREENHEIGHT = 360
+# the size of the pre-rendered map chunks (tiles)
+CHUNKSIZE = 16
+# the memory budget of the image cache (bytes)
+ASSETCACHEBUDGET = 64 * 1024 * 1024
+# the max amount of rendered text surfaces to cache
+TEXTCACHESIZE = 256
+# the max amount of live particles in a scene
+PARTICLECAPACITY = 8192
+# the cell size of the wall collision grids (pixels)
+COLLISIONCELLSIZE = 64
+# the cell size of the per-frame combat spatial hash (pixels)
+COMBATCELLSIZE = 64
+# the initial amount of bodies in the physics world
+PHYSICSCAPACITY = 256
+# the initial amount of knights of the enemy manager
+ENEMYCAPACITY = 256
+# the initial amount of animations of the animator
+ANIMATIONCAPACITY = 256
+# the amount of knights and fire balls created in advance for the pools of a scene
+KNIGHTPOOLSIZE = 16
+FIREBALLPOOLSIZE = 8
+# horde mode: the knights of the first wave, the knights added every wave and the most knights of a wave
+HORDEWAVESIZE = 50
+HORDEWAVEGROWTH = 50
+HORDEMAXWAVESIZE = 500
+# horde mode: the time between spawns (ms) and the amount of spawn points used by each spawn
+HORDESPAWNINTERVAL = 100
+HORDEFANOUT = 4
+# horde mode: where the frame time statistics of the waves are saved
+HORDESTATSPATH = 'horde_stats.json'
+# profiler: the frames kept in the ring buffer(one pixel of the graph each), the height of the
+# overlay and the pixels of the graph per ms
+PROFILERFRAMES = 240
+PROFILERHEIGHT = 160
+PROFILERSCALE = 4
+# soak test: the rounds of the infinite mode played
+SOAKROUNDS = 100
+# env: the copies of a scene run by env.py, the simulation steps of an env step and the most
+# enemies observed
+ENVAMOUNT = 64
+ENVSTEPS = 4
+ENVMAXENEMIES = 16
+# bot: how close a knight must be to be slashed and how far it may be to get a fire ball (pixels)
+BOTREACH = 30
+BOTFIRERANGE = 250
+# bot: how long a fire ball is charged and the time between fire balls (ms)
+BOTFIREHOLD = 300
+BOTFIREINTERVAL = 2000
+# bot: how far the player must walk not to be stuck (pixels)
+BOTSTUCKDISTANCE = 8
+# bot: how long the player is stuck before jumping, and how long it walks back after (ms)
+BOTSTUCKTIME = 250
+BOTTURNTIME = 1000
+# bot: how long a knight is chased without any knight being slain before it's given up (ms)
+BOTGIVEUPTIME = 8000
+# frame check: the replayed frames hashed by default, one in this many
+FRAMECHECKINTERVAL = 30
+# frame check: where the golden frames are kept and where the image of a diverging frame is saved
+FRAMECHECKGOLDEN = 'golden_frames'
+FRAMECHECKDIFF = 'frame_diff.png'
+# benchmark: the frames timed in each scene and the frames run before the timing starts
+BENCHMARKFRAMES = 1200
+BENCHMARKWARMUP = 60
+# benchmark: where the results are saved
+BENCHMARKPATH = 'benchmark.json'
 # color
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -59,6 +128,9 @@ KNIGHT02 = 'gameArts/images/knight02.png'
 KNIGHT03 = 'gameArts/images/knight03.png'
 FIGHTER = 'gameArts/images/fighter.png'
 FIREBALL = 'gameArts/images/fireball.png'
+# the fire ball frames baked from the fire ball sheet by bake.py
+FIREBALLFRAMES = 'gameArts/images/fireball_frames.png'
+FIREBALLSIZE = 15
 # player state
 RIGHT = 'right'
 LEFT = 'left'
@@ -103,6 +175,6 @@ BEHITSOUND = 'gameArts/music/sounds/be_hit.wav'
 THROWFIREBALLSOUND = 'gameArts/music/sounds/throw_fire_ball.wav'
 EXPLOSIONSOUND = 'gameArts/music/sounds/explosion.wav'
 HEALSOUND = 'gameArts/music/sounds/heal.wav'
-# volume
+# initial volume of the sound buses
 sound_volume = 0.5
 bgm_volume = 0.5
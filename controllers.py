@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+import pygame as pg
+import constants as c
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class Controller:
+    """The commands of the player, decided once every step of the simulation.
+       The player and the scene read them instead of the keyboard.
+           left, right, jump, attack: held in this step
+           fire: the fire ball key is held. A fire ball is charged while it's held.
+           fire_pressed, fire_released: the fire ball key was pressed or released in this step
+       Subclasses set the held commands in decide()."""
+
+    def __init__(self, scene) -> None:
+        self.scene = scene
+        self.left = False
+        self.right = False
+        self.jump = False
+        self.attack = False
+        self.fire = False
+        self.fire_pressed = False
+        self.fire_released = False
+
+    def begin_tick(self):
+        held = self.fire
+        self.decide()
+        self.fire_pressed = self.fire and not held
+        self.fire_released = held and not self.fire
+
+    def decide(self):
+        pass
+
+
+class KeyboardController(Controller):
+    """The commands of the scene input: a and d move, k jumps, j slashes, l throws a fire ball."""
+
+    def begin_tick(self):
+        keys = self.scene.input.pressed()
+        self.left = keys[c.K_a]
+        self.right = keys[c.K_d]
+        self.jump = keys[c.K_k]
+        self.attack = keys[c.K_j]
+        self.fire_pressed = False
+        self.fire_released = False
+        for event in self.scene.input.events():
+            if event.type == pg.KEYDOWN and event.key == c.K_l:
+                self.fire_pressed = True
+                self.fire = True
+            elif event.type == pg.KEYUP and event.key == c.K_l:
+                self.fire_released = True
+                self.fire = False
+
+
+class BotController(Controller):
+    """A heuristic player. It walks to the nearest knight, slashes it when it's in reach, throws
+       fire balls at the knights a bit further away and jumps over what stops it. If it slays no
+       knight for a while, the knight it chases is given up. Without knights it walks to the exit,
+       or to the start of the rounds in the infinite mode.
+       It only reads the simulation state, so a playthrough is the same every time."""
+
+    def __init__(self, scene) -> None:
+        super().__init__(scene)
+        # The player is stuck if it walks without getting BOTSTUCKDISTANCE away from anchor_x.
+        self.anchor_x = 0
+        self.anchor_at = 0  # the time the anchor was set(ms)
+        self.turn_until = 0  # the bot walks the other way until this time(ms) to get unstuck
+        self.fire_until = 0  # the fire ball key is held until this time(ms)
+        self.next_fire = 0  # the time the next fire ball may be thrown(ms)
+        # If no knight has been slain for a while, the chased one is given up.
+        self.knights_left = 0
+        self.slain_at = 0  # the time a knight was last slain(ms)
+        self.given_up = set()
+
+    def target(self):
+        """Get the point the bot heads for, or None to stay."""
+        scene = self.scene
+        x, y = scene.player.body_rect.center
+        now = scene.now
+        # Released knights may come back from the pool as new ones.
+        self.given_up = {knight for knight in self.given_up if knight.alive()}
+        knights = [knight for knight in scene.enemies
+                   if not knight.slain and knight not in self.given_up]
+        if len(knights) < self.knights_left:
+            self.slain_at = now
+        self.knights_left = len(knights)
+        if knights:
+            knight = min(knights, key=lambda knight: abs(knight.body_rect.centerx - x) +
+                         2 * abs(knight.body_rect.centery - y))
+            if now - self.slain_at > c.BOTGIVEUPTIME:
+                self.given_up.add(knight)
+                self.slain_at = now
+            return knight.body_rect.center
+        rects = scene.enter_rects
+        if 'game_begin' in rects:
+            if not scene.game_begin:
+                return rects['game_begin'].center
+            return None
+        if 'exit' in rects and not scene.player.body_rect.colliderect(rects['exit']):
+            return rects['exit'].center
+        return None
+
+    def decide(self):
+        scene = self.scene
+        player = scene.player
+        now = scene.now
+        x, y = player.body_rect.center
+        self.left = self.right = self.jump = self.attack = False
+        self.fire = now < self.fire_until
+        target = self.target()
+        if target is None:
+            return
+        dx, dy = target[0] - x, target[1] - y
+        facing_right = player.state in (c.RIGHT, c.FACING_RIGHT)
+        near = abs(dy) < c.BOTREACH
+        if near and abs(dx) < c.BOTREACH and self.scene.enemies:
+            # Face the knight and slash it.
+            if (dx > 0) != facing_right:
+                self.right, self.left = dx > 0, dx < 0
+            else:
+                self.attack = True
+        else:
+            if now < self.turn_until:
+                dx = -dx
+            self.right, self.left = dx > 0, dx < 0
+            if (near and self.scene.enemies and player.fire_ball_amount > 0 and
+                    now >= self.next_fire and abs(dx) < c.BOTFIRERANGE and (dx > 0) == facing_right):
+                # Charge a fire ball and throw it at the knight.
+                self.fire = True
+                self.fire_until = now + c.BOTFIREHOLD
+                self.next_fire = now + c.BOTFIREINTERVAL
+            if dy < -c.BOTREACH:
+                # The target is above.
+                self.jump = True
+        # Jump over what stops the player, and turn back if it doesn't help.
+        if not (self.left or self.right) or abs(x - self.anchor_x) > c.BOTSTUCKDISTANCE:
+            self.anchor_x, self.anchor_at = x, now
+        elif now - self.anchor_at > 4 * c.BOTSTUCKTIME:
+            self.turn_until = now + c.BOTTURNTIME
+            self.anchor_x, self.anchor_at = x, now
+        elif now - self.anchor_at > c.BOTSTUCKTIME:
+            self.jump = True
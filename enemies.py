@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+import numpy as np
+from constants import LEFT, RIGHT, ENEMYCAPACITY
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class ArrayField:
+    """A knight attribute stored in an array of the enemy manager.
+       codes maps the attribute values to the numbers stored in the array."""
+
+    def __init__(self, name, codes=None) -> None:
+        self.name = name
+        self.codes = codes
+        self.values = None if codes is None else {
+            code: value for value, code in codes.items()}
+
+    def __get__(self, knight, owner=None):
+        if knight is None:
+            return self
+        value = getattr(knight.manager, self.name)[knight.slot].item()
+        return value if self.values is None else self.values[value]
+
+    def __set__(self, knight, value):
+        if self.codes is not None:
+            value = self.codes[value]
+        getattr(knight.manager, self.name)[knight.slot] = value
+
+
+# codes of the knight attributes
+STATECODES = {RIGHT: 1, LEFT: -1}
+MOVEDIRCODES = {'r': 1, 'l': -1}
+ATTACKDIRCODES = {None: 0, 'attack_right': 1, 'attack_left': -1}
+
+
+class EnemyManager:
+    """The AI state of all knights in a scene, one slot of each array per knight.
+       update() runs the AI of all knights at once: the slain knights, the attack triggers
+       near the player and the patrol movement. The Knight objects only animate and
+       draw themselves, and their AI attributes are views of these arrays(see ArrayField)."""
+
+    def __init__(self, scene, capacity=ENEMYCAPACITY) -> None:
+        self.scene = scene
+        self.capacity = capacity
+        self.used = np.zeros(capacity, dtype=bool)
+        self.body = np.zeros(capacity, dtype=np.int64)  # the body in the physics world
+        self.speed = np.zeros(capacity)
+        self.hv = np.zeros(capacity, dtype=np.int64)
+        self.state = np.zeros(capacity, dtype=np.int8)  # 1: RIGHT, -1: LEFT
+        self.move_dir = np.zeros(capacity, dtype=np.int8)  # 1: 'r', -1: 'l'
+        self.attack_dir = np.zeros(capacity, dtype=np.int8)  # 1: right, -1: left, 0: None
+        self.attacking = np.zeros(capacity, dtype=bool)
+        self.slain = np.zeros(capacity, dtype=bool)
+        self.invincible = np.zeros(capacity, dtype=bool)
+        self.knights = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        # settings shared by all knights
+        self.invincible_interval = 500
+        self.attack_range = 45  # how far in front of a knight the player is attacked
+        self.attack_height = 20
+
+    def add(self, knight, body, speed, hv):
+        """Give the knight a slot. Return the slot."""
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.used[slot] = True
+        self.body[slot] = body
+        self.speed[slot] = speed
+        self.hv[slot] = hv
+        self.state[slot] = STATECODES[RIGHT]
+        self.move_dir[slot] = MOVEDIRCODES['r']
+        self.attack_dir[slot] = 0
+        self.attacking[slot] = False
+        self.slain[slot] = False
+        self.invincible[slot] = False
+        self.knights[slot] = knight
+        return slot
+
+    def remove(self, slot):
+        """Free the slot. Removing a removed slot does nothing."""
+        if self.used[slot]:
+            self.used[slot] = False
+            self.knights[slot] = None
+            self.free.append(slot)
+
+    def grow(self):
+        """Double the capacity."""
+        old = self.capacity
+        self.capacity *= 2
+        for name in ('used', 'body', 'speed', 'hv', 'state', 'move_dir', 'attack_dir', 'attacking',
+                     'slain', 'invincible'):
+            array = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.knights += [None] * old
+        self.free = list(range(self.capacity - 1, old - 1, -1)) + self.free
+
+    def update(self, player):
+        """Update the AI of all knights.
+            The animations may end the attacks, so they are updated before."""
+        slots = np.flatnonzero(self.used)
+        if len(slots) == 0:
+            return
+        # If the hv is less than 1, the knight is slain.
+        self.slain[slots] |= self.hv[slots] < 1
+        # A slain knight stops moving.
+        physics = self.scene.physics
+        bodies = self.body[slots]
+        physics.active[bodies] = ~self.slain[slots]
+        alive = slots[~self.slain[slots]]
+        bodies = self.body[alive]
+        # Attacking knights stand.
+        attacking = self.attacking[alive]
+        physics.vel[bodies[attacking], 0] = 0
+        # The others attack the player if he is right in front of them, and keep moving.
+        alive, bodies = alive[~attacking], bodies[~attacking]
+        center_x = physics.rect[bodies, 0] + physics.size[bodies, 0] // 2
+        center_y = physics.rect[bodies, 1] + physics.size[bodies, 1] // 2
+        # the distance in front of the knights
+        ahead = (player.rect.centerx - center_x) * self.state[alive]
+        near = ((0 < ahead) & (ahead < self.attack_range) &
+                (np.abs(player.rect.centery - center_y) < self.attack_height))
+        self.attacking[alive] = near
+        self.attack_dir[alive] = np.where(near, self.state[alive], 0)
+        self.state[alive] = self.move_dir[alive]
+        physics.vel[bodies, 0] = self.speed[alive] * self.move_dir[alive]
+
+    def read_contacts(self):
+        """Turn the knights that hit a wall in the last physics step around."""
+        slots = np.flatnonzero(self.used & ~self.slain)
+        hit_x = self.scene.physics.hit_x[self.body[slots]]
+        self.move_dir[slots] = np.where(hit_x != 0, -hit_x, self.move_dir[slots])
+
+    def __len__(self):
+        return int(self.used.sum())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+import os
+import argparse
+import multiprocessing
+import random
+import time
+import numpy as np
+import pygame as pg
+import constants as c
+from replay import LiveInput, KeyState, RECORDEDKEYS
+from tools import SCENES, LEVELS, headless_control
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# the keys of an action, one bit each. An action holds them for the steps of an env step.
+ACTIONKEYS = RECORDEDKEYS + (c.K_l,)
+# the bit of the fire ball key. A fire ball is charged while it's held and thrown when it's released.
+FIREBALLBIT = 1 << ACTIONKEYS.index(c.K_l)
+
+
+class ActionInput(LiveInput):
+    """The input of a scene driven by actions instead of the keyboard.
+       The menus aren't shown. The scene is over when it would ask one."""
+
+    def __init__(self, seed) -> None:
+        super().__init__()
+        self.seed = seed
+        self.action = 0
+        self.last_action = 0
+
+    def begin_scene(self, scene):
+        return self.seed
+
+    def begin_tick(self):
+        self.keys = KeyState(self.action & ~FIREBALLBIT)
+        self.tick_events = []
+        # Pressing and releasing the fire ball key are events.
+        if (self.action ^ self.last_action) & FIREBALLBIT:
+            type = pg.KEYDOWN if self.action & FIREBALLBIT else pg.KEYUP
+            self.tick_events.append(pg.event.Event(type, key=c.K_l))
+        self.last_action = self.action
+
+    def choose(self, menu):
+        # Exit the scene, which ends the episode.
+        return True
+
+
+class BattleEnv:
+    """A headless battle scene stepped by actions. Each step holds the action for `steps`
+       simulation steps and returns the observation:
+           player_pos, hv, fire_ball_amount, game_round(0 out of the infinite mode),
+           enemy_pos(ENVMAXENEMIES x 2, padded with zeros) and enemy_mask, done.
+       The scene starts again when it's over. Every env has its own random numbers, so it
+       plays the same whichever process or order it's stepped in."""
+
+    def __init__(self, control, scene='infinite_mode_cliff', seed=0, steps=c.ENVSTEPS) -> None:
+        self.control = control
+        self.scene_name = scene
+        self.seed = seed
+        self.steps = steps
+        self.episodes = 0
+        self.scene = None
+        self.input = None
+        self.random_state = None
+
+    def reset(self):
+        """Start the scene again. Return the first observation."""
+        glo = self.control.glo
+        glo.next_scene = [self.scene_name, 'player01']
+        # Every episode is seeded by the env seed and the episode.
+        self.input = ActionInput(self.seed << 20 | self.episodes)
+        self.episodes += 1
+        glo.input = self.input
+        scene_class, map_path = SCENES[self.scene_name]
+        random_state = random.getstate()
+        self.scene = scene_class(self.control.clock, self.control.screen, glo.display, glo, 1.5)
+        self.scene.load_data(map_path)
+        self.scene.new()
+        self.scene.render = False
+        if self.scene_name == 'infinite_mode_cliff':
+            # Begin the first round right away.
+            self.scene.player.rect.center = self.scene.enter_rects['game_begin'].center
+        self.random_state = random.getstate()
+        random.setstate(random_state)
+        return self.observe()
+
+    def step(self, action):
+        """Hold the action(a mask of ACTIONKEYS) for the steps of an env step.
+            Return the observation."""
+        scene = self.scene
+        self.input.action = action
+        random_state = random.getstate()
+        random.setstate(self.random_state)
+        for _ in range(self.steps):
+            if scene.next_scene is not None:
+                break
+            scene.step()
+        self.random_state = random.getstate()
+        random.setstate(random_state)
+        observation = self.observe()
+        if observation['done']:
+            observation = self.reset()
+            observation['done'] = True
+        return observation
+
+    def observe(self):
+        scene = self.scene
+        enemy_pos = np.zeros((c.ENVMAXENEMIES, 2))
+        enemy_mask = np.zeros(c.ENVMAXENEMIES, dtype=bool)
+        for i, enemy in enumerate(scene.enemies.sprites()[:c.ENVMAXENEMIES]):
+            enemy_pos[i] = enemy.body_rect.center
+            enemy_mask[i] = True
+        return {'player_pos': np.array(scene.player.body_rect.center, dtype=float),
+                'hv': scene.player.hv, 'fire_ball_amount': scene.player.fire_ball_amount,
+                'game_round': getattr(scene, 'game_round', 0),
+                'enemy_pos': enemy_pos, 'enemy_mask': enemy_mask,
+                'done': scene.next_scene is not None}
+
+
+def worker(conn, scene, seeds, steps):
+    """Run the envs of the seeds in this process, for the commands of the VectorEnv."""
+    control = headless_control()
+    envs = [BattleEnv(control, scene, seed, steps) for seed in seeds]
+    while True:
+        command, data = conn.recv()
+        if command == 'reset':
+            conn.send([env.reset() for env in envs])
+        elif command == 'step':
+            conn.send([env.step(action) for env, action in zip(envs, data)])
+        elif command == 'close':
+            conn.close()
+            return
+
+
+def stack(observations):
+    """Stack the observations of the envs into arrays with one row per env."""
+    return {key: np.stack([np.asarray(o[key]) for o in observations]) for key in observations[0]}
+
+
+class VectorEnv:
+    """Copies of a battle scene split among worker processes, stepped together.
+       step(actions) takes one action per env and returns the stacked observations."""
+
+    def __init__(self, amount, scene='infinite_mode_cliff', workers=None, seed=0,
+                 steps=c.ENVSTEPS) -> None:
+        self.amount = amount
+        workers = min(workers or os.cpu_count() or 1, amount)
+        # The envs are dealt to the workers in contiguous slices.
+        seeds = np.array_split(np.arange(seed, seed + amount), workers)
+        self.sizes = [len(part) for part in seeds]
+        # Spawn fresh processes, so each one sets pygame up on its own.
+        context = multiprocessing.get_context('spawn')
+        self.conns = []
+        self.processes = []
+        for part in seeds:
+            conn, child = context.Pipe()
+            process = context.Process(target=worker, args=(child, scene, part.tolist(), steps),
+                                      daemon=True)
+            process.start()
+            child.close()
+            self.conns.append(conn)
+            self.processes.append(process)
+
+    def reset(self):
+        for conn in self.conns:
+            conn.send(('reset', None))
+        return stack([o for conn in self.conns for o in conn.recv()])
+
+    def step(self, actions):
+        begin = 0
+        for conn, size in zip(self.conns, self.sizes):
+            conn.send(('step', [int(action) for action in actions[begin:begin + size]]))
+            begin += size
+        return stack([o for conn in self.conns for o in conn.recv()])
+
+    def close(self):
+        for conn in self.conns:
+            conn.send(('close', None))
+        for process in self.processes:
+            process.join()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Step copies of a battle scene with random actions.')
+    parser.add_argument('--envs', type=int, default=c.ENVAMOUNT, help='the amount of envs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='the worker processes, one per core by default')
+    parser.add_argument('--scene', choices=LEVELS,
+                        default='infinite_mode_cliff', help='the scene of the envs')
+    parser.add_argument('--steps', type=int, default=1000, help='the env steps to run')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the first env')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    env = VectorEnv(args.envs, args.scene, args.workers, args.seed)
+    observation = env.reset()
+    rng = np.random.default_rng(args.seed)
+    episodes = 0
+    begin = time.perf_counter()
+    for _ in range(args.steps):
+        observation = env.step(rng.integers(0, 1 << len(ACTIONKEYS), args.envs))
+        episodes += int(observation['done'].sum())
+    elapsed = time.perf_counter() - begin
+    env.close()
+    print('%d envs, %d steps in %.1f s: %.0f env steps/s, %.0fx realtime each, %d episodes ended'
+          % (args.envs, args.steps, elapsed, args.envs * args.steps / elapsed,
+             args.steps * c.ENVSTEPS / c.SIMULATIONRATE / elapsed, episodes))
+    print('max round: %d' % observation['game_round'].max())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+import os
+import argparse
+import hashlib
+import json
+import sys
+import pygame as pg
+import constants as c
+from replay import read_log, replay_scene
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+def frame_hash(screen):
+    """Get the hash of the pixels of the game screen."""
+    return hashlib.sha1(pg.image.tobytes(screen, 'RGB')).hexdigest()
+
+
+def frame_key(scene_index, frame):
+    """Get the name of a frame of the log: the scene in the log and the frame in the scene."""
+    return '%02d-%05d' % (scene_index, frame)
+
+
+def diff_image(expected, actual):
+    """Get the expected frame, the actual frame and their differing pixels(red) side by side.
+        Return the image and the amount of differing pixels."""
+    a = pg.surfarray.array3d(expected)
+    b = pg.surfarray.array3d(actual)
+    differs = (a != b).any(axis=2)
+    # The differing pixels are red over the dimmed actual frame.
+    diff = b // 3
+    diff[differs] = (255, 0, 0)
+    w, h = expected.get_size()
+    image = pg.Surface((w * 3, h))
+    image.blit(expected, (0, 0))
+    image.blit(actual, (w, 0))
+    image.blit(pg.surfarray.make_surface(diff), (w * 2, 0))
+    return image, int(differs.sum())
+
+
+class FrameCheck:
+    """The hashes of the chosen frames of a replayed log.
+       Recording keeps the hash and the image of each chosen frame as the golden set.
+       Checking compares the frames of the golden set with the replayed ones and keeps the first
+       frame that diverges."""
+
+    def __init__(self, golden, record=False, every=c.FRAMECHECKINTERVAL, frames=None) -> None:
+        self.golden = golden  # the directory of the golden set
+        self.record = record
+        self.every = every
+        self.frames = set(frames or ())  # frames chosen besides one in every
+        self.scene_index = 0
+        self.hashes = {}  # {frame key: hash}
+        self.expected = {}  # the golden hashes when checking
+        self.checked = 0
+        self.diverged = []  # the keys of the diverging frames
+        self.first = None  # (key, expected image, actual image) of the first diverging frame
+        if not record:
+            with open(os.path.join(golden, 'hashes.json')) as f:
+                self.expected = json.load(f)['frames']
+
+    def chosen(self, key, frame):
+        if self.record:
+            return frame % self.every == 0 or frame in self.frames
+        return key in self.expected
+
+    def on_frame(self, scene, frame):
+        key = frame_key(self.scene_index, frame)
+        if not self.chosen(key, frame):
+            return
+        digest = frame_hash(scene.screen)
+        self.hashes[key] = digest
+        if self.record:
+            pg.image.save(scene.screen, os.path.join(self.golden, key + '.png'))
+            return
+        self.checked += 1
+        if digest != self.expected[key]:
+            self.diverged.append(key)
+            if self.first is None:
+                expected = pg.image.load(os.path.join(self.golden, key + '.png'))
+                self.first = (key, expected, scene.screen.copy())
+
+    def save(self, log):
+        with open(os.path.join(self.golden, 'hashes.json'), 'w') as f:
+            json.dump({'log': os.path.basename(log), 'every': self.every, 'frames': self.hashes},
+                      f, indent=2)
+
+
+def check_log(control, log, check):
+    """Replay the scenes of the log headless and hash their frames. Return the recorded scenes
+        and if each one reproduced its recorded state."""
+    scenes = read_log(log)
+    matched = []
+    for index, recorded in enumerate(scenes):
+        check.scene_index = index
+        matched.append(replay_scene(control, recorded, True, False, check.on_frame))
+    return scenes, matched
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Hash the frames of a replayed input log and compare them with a golden set.')
+    parser.add_argument('log', help='the input log recorded by theKnight.py --record')
+    parser.add_argument('--golden', default=c.FRAMECHECKGOLDEN,
+                        help='the directory of the golden frames')
+    parser.add_argument('--record', action='store_true',
+                        help='record the golden frames instead of checking them')
+    parser.add_argument('--every', type=int, default=c.FRAMECHECKINTERVAL,
+                        help='record one frame in this many')
+    parser.add_argument('--frames', type=int, nargs='+', default=(),
+                        help='more frames of each scene to record')
+    parser.add_argument('--diff', default=c.FRAMECHECKDIFF,
+                        help='where the image of the first diverging frame is saved')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    from tools import headless_control
+    if args.record:
+        os.makedirs(args.golden, exist_ok=True)
+    check = FrameCheck(args.golden, args.record, args.every, args.frames)
+    control = headless_control()
+    scenes, matched = check_log(control, args.log, check)
+    for recorded, match in zip(scenes, matched):
+        if match is False:
+            # The input doesn't play the same game, so the frames can't be compared.
+            print('%s: the state diverged from the recording' % recorded.name)
+    if args.record:
+        check.save(args.log)
+        print('%d frames recorded to %s' % (len(check.hashes), args.golden))
+        pg.quit()
+        sys.exit()
+    print('%d of %d golden frames checked, %d diverged' % (
+        check.checked, len(check.expected), len(check.diverged)))
+    if check.first is not None:
+        key, expected, actual = check.first
+        image, pixels = diff_image(expected, actual)
+        pg.image.save(image, args.diff)
+        print('first diverging frame: %s (scene-frame), %d pixels differ, saved to %s' % (
+            key, pixels, args.diff))
+    pg.quit()
+    sys.exit(1 if check.diverged or check.checked < len(check.expected) else 0)
@@ -2,6 +2,9 @@
 import time
 import pickle
 from pygame import display
+from presenters import SoftwarePresenter, ScaledPresenter
+from replay import LiveInput
+from controllers import KeyboardController
 
 
 __author__ = 'Geoff Yulong Li'
@@ -35,20 +38,42 @@ class Archive:
 
 class Global:
 
-    def __init__(self) -> None:
+    def __init__(self, presenter='software') -> None:
         self.next_scene = ['loading_menu', None]
         self.archive_no = None
         self.archive = None
         self.has_loaded_archive = False
         # Whether to play main menu music or not.
         self.ready_to_play_menu_bgm = True
+        # Whether to show the profiler overlay in the battle scenes or not.
+        self.show_profiler = False
+        # the input of the battle scenes. It's an InputRecorder if the game is recorded.
+        self.input = LiveInput()
+        # the controller class of the player in the battle scenes
+        self.controller = KeyboardController
         display.init()
         self.full_display_w = display.Info().current_w
         self.full_display_h = display.Info().current_h
         self.display_width = self.full_display_w
         self.display_height = self.full_display_h
-        self.display = display.set_mode(
-            (self.display_width, self.display_height))
+        # 'software' scales the screen on the CPU, 'scaled' lets the SDL renderer scale it.
+        if presenter == 'scaled':
+            self.presenter = ScaledPresenter(
+                self.display_width, self.display_height)
+        else:
+            self.presenter = SoftwarePresenter(
+                self.display_width, self.display_height)
+        self.display = self.presenter.display
+
+    def set_resolution(self, width, height, full_screen=False):
+        """Change the size of the game window."""
+        self.display_width = width
+        self.display_height = height
+        self.display = self.presenter.set_size(width, height, full_screen)
+
+    def present(self, screen, pos=(0, 0)):
+        """Scale the screen surface to the game window."""
+        self.presenter.present(screen, pos)
 
     def update_archive(self, lv, coin):
         if self.archive is not None:
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+import pygame as pg
+from assets import fonts
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class GlyphAtlas:
+    """The glyphs of some characters rendered side by side on one surface.
+       Text made of these characters is drawn by blitting areas of the atlas."""
+
+    def __init__(self, font, font_size, color, chars='0123456789/-') -> None:
+        glyphs = [fonts.render(font, font_size, char, color) for char in chars]
+        self.height = max(glyph.get_height() for glyph in glyphs)
+        self.surf = pg.Surface(
+            (sum(glyph.get_width() for glyph in glyphs), self.height), pg.SRCALPHA)
+        self.areas = {}  # char: the area of the glyph on the atlas
+        x = 0
+        for char, glyph in zip(chars, glyphs):
+            self.surf.blit(glyph, (x, 0), None, pg.BLEND_RGBA_MAX)
+            self.areas[char] = pg.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        return sum(self.areas[char].width for char in text)
+
+    def draw(self, surface, text, pos):
+        """Blit the text to the surface. The text must only contain the characters of the atlas."""
+        x, y = pos
+        for char in text:
+            area = self.areas[char]
+            # Copy the glyph pixels as they are. Alpha blending would darken their edges.
+            surface.blit(self.surf, (x, y), area, pg.BLEND_RGBA_MAX)
+            x += area.width
+
+
+class HudField:
+    """A label followed by a value. value() returns an int or a tuple of ints(shown as a/b)."""
+
+    def __init__(self, label, value, x) -> None:
+        self.label = label
+        self.value = value
+        self.x = x
+        self.last_value = None
+        self.text = ''
+
+
+class Hud:
+    """Text fields bound to values of the scene, drawn from one cached surface.
+       A field is only rendered again when its value changes. The labels are rendered once
+       and the values are composed from a glyph atlas.
+       The HUD moves from initial_pos to pos like buttons.Text."""
+
+    def __init__(self, screen, font, font_size, color, initial_pos, pos) -> None:
+        self.screen = screen
+        self.font = font
+        self.font_size = font_size
+        self.color = color
+        self.atlas = GlyphAtlas(font, font_size, color)
+        self.fields = []
+        self.surf = None
+        self.initial_pos = [initial_pos[0], initial_pos[1]]
+        self.pos = pos
+
+    def add_field(self, label, value, x):
+        """Add a field. x is the offset of the field from the HUD position."""
+        self.fields.append(HudField(label, value, x))
+        self.surf = None
+
+    def update(self):
+        """Move the HUD and compose the HUD surface again if any value has changed."""
+        self.move()
+        changed = self.surf is None
+        for field in self.fields:
+            value = field.value()
+            if value != field.last_value:
+                field.last_value = value
+                if isinstance(value, tuple):
+                    field.text = '/'.join(str(v) for v in value)
+                else:
+                    field.text = str(value)
+                changed = True
+        if changed:
+            self.compose()
+
+    def compose(self):
+        """Draw all fields to the HUD surface."""
+        labels = [fonts.render(self.font, self.font_size, field.label, self.color)
+                  for field in self.fields]
+        width = max([field.x + label.get_width() + self.atlas.width(field.text)
+                     for field, label in zip(self.fields, labels)] + [1])
+        height = max([label.get_height()
+                     for label in labels] + [self.atlas.height])
+        if self.surf is None or self.surf.get_size() != (width, height):
+            self.surf = pg.Surface((width, height), pg.SRCALPHA)
+        else:
+            self.surf.fill((0, 0, 0, 0))
+        for field, label in zip(self.fields, labels):
+            self.surf.blit(label, (field.x, 0), None, pg.BLEND_RGBA_MAX)
+            self.atlas.draw(self.surf, field.text,
+                            (field.x + label.get_width(), 0))
+
+    def update_init_pos(self, init_pos):
+        self.initial_pos = [init_pos[0], init_pos[1]]
+
+    def move(self):
+        """the animation of the HUD."""
+        self.initial_pos[0] += (self.pos[0] - self.initial_pos[0]) / 10
+        self.initial_pos[1] += (self.pos[1] - self.initial_pos[1]) / 10
+
+    def draw(self):
+        """Draw the HUD on the screen."""
+        if self.surf is not None:
+            self.screen.blit(self.surf, self.initial_pos)
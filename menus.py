@@ -4,6 +4,9 @@ import constants as c
 from buttons import *
 from globals import load, save, Archive
 from copy import deepcopy
+from assets import assets, fonts
+from sounds import sounds
+from scheduler import Scheduler
 
 
 __author__ = 'Geoff Yulong Li'
@@ -20,6 +23,12 @@ class Menu:
         self.screen = screen
         self.display = display
         self.glo = glo
+        self.scheduler = Scheduler()  # the timers of the menu
+
+    def tick(self):
+        """Wait for the next frame and fire the due timers."""
+        self.dt = self.clock.tick(c.FPS) / 1000
+        self.scheduler.update(pg.time.get_ticks())
 
     def new(self):
         """Initialize components of the menu."""
@@ -31,7 +40,7 @@ class Menu:
         fade.fill(c.BLACK)
         for alpha in range(255, 0, -5):
             fade.set_alpha(alpha)  # accumulative
-            self.dt = self.clock.tick(c.FPS) / 1000
+            self.tick()
             self.event_loop()
             # Update
             self.update()
@@ -46,7 +55,7 @@ class Menu:
         fade.fill(c.BLACK)
         for alpha in range(0, 255, 5):
             fade.set_alpha(alpha)  # accumulative
-            self.dt = self.clock.tick(c.FPS) / 1000
+            self.tick()
             self.event_loop()
             # Update
             self.update()
@@ -67,13 +76,11 @@ class Menu:
     def fade_draw(self, fade):
         # Draw black surf.
         self.screen.blit(fade, (0, 0))
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def draw(self):
         """Draw all components of the menu."""
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def event_loop(self):
         """Set the event loop of the menu."""
@@ -85,7 +92,7 @@ class Menu:
     def main_loop(self):
         """the main loop of the menu"""
         while self.main_loop_running:
-            self.dt = self.clock.tick(c.FPS) / 1000
+            self.tick()
             # event loop
             self.event_loop()
             # update items
@@ -113,40 +120,32 @@ class LoadingMenu(Menu):
 
     def new(self):
         """Initialize components of the menu."""
-        self.demo_font = pg.font.Font(c.KA1, 40)
+        self.demo_font = fonts.font(c.KA1, 40)
         self.author_text = self.demo_font.render(
             "AUTHOR_YULONG LI", True, (255, 255, 255))
         self.author_text_rect = self.author_text.get_rect(
             center=(c.SCREENWIDTH / 2, c.SCREENHEIGHT / 2))
-        self.timer_event = pg.USEREVENT + 1
-        pg.time.set_timer(self.timer_event, self.timer_interval)
+        self.timer = self.scheduler.every(self.timer_interval, self.count_down)
 
-    def event_loop(self):
-        """Set the event loop of the menu."""
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                pg.quit()
-                sys.exit()
-            elif event.type == self.timer_event:
-                self.counter -= 1
-                if self.counter == 0:
-                    # Exit the loading menu.
-                    self.next_scene = ['main_menu', 'press_key']
+    def count_down(self):
+        self.counter -= 1
+        if self.counter == 0:
+            # Exit the loading menu.
+            self.timer.cancel()
+            self.next_scene = ['main_menu', 'press_key']
 
     def draw(self):
         """Draw all components of the menu."""
         self.screen.fill(c.BLACK)
         self.screen.blit(self.author_text, self.author_text_rect)
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def fade_draw(self, fade):
         # Draw black surf.
         self.screen.fill(c.BLACK)
         self.screen.blit(self.author_text, self.author_text_rect)
         self.screen.blit(fade, (0, 0))
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
 
 class MainMenu(Menu):
@@ -169,20 +168,18 @@ class MainMenu(Menu):
         self.all_sprites = pg.sprite.Group()
         self.buttons = pg.sprite.Group()
         # Add wallpaper.
-        self.wall_paper = pg.transform.scale(
-            pg.image.load(c.MAINMENUWALLPAPER), (c.SCREENWIDTH, c.SCREENHEIGHT))
+        self.wall_paper = assets.image(
+            c.MAINMENUWALLPAPER, (c.SCREENWIDTH, c.SCREENHEIGHT))
         # Add enter font.
-        self.enter_font = pg.font.Font(c.KA1, 20)
+        self.enter_font = fonts.font(c.KA1, 20)
         self.enter_text = self.enter_font.render(
             "Press Any Key", True, (255, 255, 255))
         self.enter_rect = self.enter_text.get_rect(
             center=(c.SCREENWIDTH / 2, c.SCREENHEIGHT * 4 / 5))
-        # Define customed events.
-        self.winkle_event = pg.USEREVENT + 2
-        pg.time.set_timer(self.winkle_event, self.winkle_interval)
-        self.load_component_event = pg.USEREVENT + 3
-        pg.time.set_timer(self.load_component_event,
-                          self.load_component_interval)
+        # Set timers.
+        self.scheduler.every(self.winkle_interval, self.winkle)
+        self.scheduler.every(self.load_component_interval,
+                             self.load_component)
         # Add components.
         Text(self, self.screen, 'The', c.KA1, 60, c.BLUE, (
             c.SCREENWIDTH / 2, -c.SCREENHEIGHT / 4), (c.SCREENWIDTH / 2, c.SCREENHEIGHT / 5))
@@ -206,10 +203,24 @@ class MainMenu(Menu):
         self.buttons.sprites()[self.chosen_button].chosen = True
         # Set bgm and sounds
         if self.glo.ready_to_play_menu_bgm:
-            pg.mixer.music.load(c.MAINMENUBGM)
-            pg.mixer.music.set_volume(c.bgm_volume)
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.choose_sound.set_volume(c.sound_volume)
+            sounds.load_music(c.MAINMENUBGM)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
+
+    def winkle(self):
+        """Make the enter text winkle before entering."""
+        if not self.enter:
+            if self.enter_text.get_alpha() == 0:
+                self.enter_text.set_alpha(255)
+            else:
+                self.enter_text.set_alpha(0)
+
+    def load_component(self):
+        """Activate the next component after entering."""
+        if self.enter:
+            for i in range(0, len(self.activite_components)):
+                if not self.activite_components[i]:
+                    self.activite_components[i] = True
+                    break
 
     def load_game(self):
         """Get archive menu with load mode.
@@ -252,23 +263,11 @@ class MainMenu(Menu):
                     self.quit()
             # not enter
             if not self.enter:
-                # winkle effect
-                if event.type == self.winkle_event:
-                    if self.enter_text.get_alpha() == 0:
-                        self.enter_text.set_alpha(255)
-                    else:
-                        self.enter_text.set_alpha(0)
                 # Display the main menu.
-                elif event.type == pg.KEYDOWN:
+                if event.type == pg.KEYDOWN:
                     self.enter = True
             # enter
             elif self.enter:
-                # Load components.
-                if event.type == self.load_component_event:
-                    for i in range(0, len(self.activite_components)):
-                        if not self.activite_components[i]:
-                            self.activite_components[i] = True
-                            break
                 # Choose button according to the key.
                 if event.type == pg.KEYDOWN:
                     if event.key == pg.K_w or event.key == pg.K_UP:
@@ -291,7 +290,7 @@ class MainMenu(Menu):
                             self.chosen_button].chosen = True
                 if self.glo.ready_to_play_menu_bgm:
                     # Play bgm
-                    pg.mixer.music.play(loops=-1, fade_ms=1000)
+                    sounds.play_music(fade_ms=1000)
                     self.glo.ready_to_play_menu_bgm = False
 
     def draw(self):
@@ -305,8 +304,7 @@ class MainMenu(Menu):
         if self.next_scene is not None and self.next_scene[0] == 'scene_selection_menu':
             # Draw screen black.
             pg.draw.rect(self.screen, c.BLACK, self.screen.get_rect())
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def update(self):
         if self.enter:
@@ -325,8 +323,7 @@ class MainMenu(Menu):
                 sprite.draw()
         # Draw black surf.
         self.screen.blit(fade, (0, 0))
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def main(self):
         self.new()
@@ -352,8 +349,8 @@ class ArchiveMenu(Menu):
         self.all_sprites = pg.sprite.Group()
         self.buttons = pg.sprite.Group()
         # Add wallpaper.
-        self.wall_paper = pg.transform.scale(
-            pg.image.load(c.ARCHIVEMENUWALLPAPER), (c.SCREENWIDTH, c.SCREENHEIGHT))
+        self.wall_paper = assets.image(
+            c.ARCHIVEMENUWALLPAPER, (c.SCREENWIDTH, c.SCREENHEIGHT))
         # Get button text and tip text.
         if self.mode == 'load':
             button_func = [self.load_01, self.load_02, self.load_03]
@@ -385,10 +382,8 @@ class ArchiveMenu(Menu):
         # Set chosen button.
         self.buttons.sprites()[self.chosen_button].chosen = True
         # Set bgm and sounds
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.choose_sound.set_volume(c.sound_volume)
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
         # Fade in effect
         self.screen_pos = (0, 0)
         self.screen_rect = self.screen.get_rect(
@@ -530,8 +525,7 @@ class ArchiveMenu(Menu):
         self.screen.blit(self.wall_paper, (0, 0))
         for sprite in self.all_sprites:
             sprite.draw()
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), self.screen_rect)
+        self.glo.present(self.screen, self.screen_rect)
 
     def update(self):
         # Update the pos of the screen rect.
@@ -585,14 +579,13 @@ class SettingsMenu(Menu):
         self.archive_group = pg.sprite.Group()
         self.archive_buttons_group = pg.sprite.Group()
         # Add wallpaper and its cover.
-        self.wall_paper = pg.transform.scale(
-            pg.image.load(c.SETTINGSWALLPAPER), (c.SCREENWIDTH, c.SCREENHEIGHT))
+        self.wall_paper = assets.image(
+            c.SETTINGSWALLPAPER, (c.SCREENWIDTH, c.SCREENHEIGHT))
         self.wall_paper_cover = pg.Surface((c.SCREENWIDTH, c.SCREENHEIGHT))
         self.wall_paper_cover.set_alpha(125)
-        # Define the customed event.
-        self.load_component_event = pg.USEREVENT + 4
-        pg.time.set_timer(self.load_component_event,
-                          self.load_component_interval)
+        # Set the timer of the initial components animation.
+        self.scheduler.every(self.load_component_interval,
+                             self.load_component)
         # Add initial sprites.
         Text(self, self.screen, 'SETTINGS', c.KA1, 40, c.WHITE, (
             -c.SCREENWIDTH / 4, c.SCREENHEIGHT / 25), (c.SCREENWIDTH / 16, c.SCREENHEIGHT / 25), self.initial_group)
@@ -628,9 +621,9 @@ class SettingsMenu(Menu):
              c.SCREENHEIGHT * 8 / 18), (c.SCREENWIDTH * 17 / 40, c.SCREENHEIGHT * 8 / 18), self.volume_group)
         Text(self, self.screen, 'effect: ', c.TICKETING, 40, c.WHITE, (c.SCREENWIDTH * 17 / 40,
              c.SCREENHEIGHT * 10 / 18), (c.SCREENWIDTH * 17 / 40, c.SCREENHEIGHT * 10 / 18), self.volume_group)
-        self.dynamic_text01 = Text(self, self.screen, '{0:2}'.format(str(round(c.bgm_volume * 10))), c.TICKETING, 40, c.WHITE, (c.SCREENWIDTH * 19 / 30,
+        self.dynamic_text01 = Text(self, self.screen, '{0:2}'.format(str(round(sounds.volume('bgm') * 10))), c.TICKETING, 40, c.WHITE, (c.SCREENWIDTH * 19 / 30,
                                                                                                                                 c.SCREENHEIGHT * 8 / 18), (c.SCREENWIDTH * 19 / 30, c.SCREENHEIGHT * 8 / 18), self.volume_group)
-        self.dynamic_text02 = Text(self, self.screen, '{0:2}'.format(str(round(c.sound_volume * 10))), c.TICKETING, 40, c.WHITE, (c.SCREENWIDTH * 19 / 30,
+        self.dynamic_text02 = Text(self, self.screen, '{0:2}'.format(str(round(sounds.volume('sfx') * 10))), c.TICKETING, 40, c.WHITE, (c.SCREENWIDTH * 19 / 30,
                                                                                                                                   c.SCREENHEIGHT * 10 / 18), (c.SCREENWIDTH * 19 / 30, c.SCREENHEIGHT * 10 / 18), self.volume_group)
         Button(self, self.screen, '<', self.turn_down_bgm, c.TICKETING, 40, (c.SCREENWIDTH / 15, c.SCREENHEIGHT / 10), (c.SCREENWIDTH *
                22 / 30, c.SCREENHEIGHT * 15 / 36), (c.SCREENWIDTH * 22 / 30, c.SCREENHEIGHT * 15 / 36), self.volume_group, self.volume_buttons_group)
@@ -675,10 +668,8 @@ class SettingsMenu(Menu):
         self.archive_buttons_group.sprites(
         )[self.archive_chosen_button].chosen = True
         # Set bgm and sounds
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.choose_sound.set_volume(c.sound_volume)
-        self.confirm_sound.set_volume(c.sound_volume)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
         # Fade in effect
         self.screen_pos = (0, 0)
         self.screen_rect = self.screen.get_rect(
@@ -686,32 +677,17 @@ class SettingsMenu(Menu):
         self.initial_screen_pos = [self.screen_rect.x, self.screen_rect.y]
 
     def set_full_screen(self):
-        self.glo.display_width = self.glo.full_display_w
-        self.glo.display_height = self.glo.full_display_h
-        self.glo.display = pg.display.set_mode(
-            (self.glo.display_width, self.glo.display_height), pg.FULLSCREEN)
-        self.next_scene = ['settings_menu']
+        self.glo.set_resolution(
+            self.glo.full_display_w, self.glo.full_display_h, True)
 
     def set_640x360(self):
-        self.glo.display_width = 640
-        self.glo.display_height = 360
-        self.glo.display = pg.display.set_mode(
-            (self.glo.display_width, self.glo.display_height))
-        self.next_scene = ['settings_menu']
+        self.glo.set_resolution(640, 360)
 
     def set_800x450(self):
-        self.glo.display_width = 800
-        self.glo.display_height = 450
-        self.glo.display = pg.display.set_mode(
-            (self.glo.display_width, self.glo.display_height))
-        self.next_scene = ['settings_menu']
+        self.glo.set_resolution(800, 450)
 
     def set_1280x720(self):
-        self.glo.display_width = 1280
-        self.glo.display_height = 720
-        self.glo.display = pg.display.set_mode(
-            (self.glo.display_width, self.glo.display_height))
-        self.next_scene = ['settings_menu']
+        self.glo.set_resolution(1280, 720)
 
     def show_submenu(self, submenu):
         for key in self.submenu_boolean.keys():
@@ -774,22 +750,24 @@ class SettingsMenu(Menu):
         self.next_scene = ['main_menu', 'main']
         self.quit_scene = True
 
-    # inappropriate code here
     def turn_up_bgm(self):
-        if c.bgm_volume < 0.9:
-            c.bgm_volume += 0.1
+        if sounds.volume('bgm') < 0.9:
+            sounds.set_volume('bgm', sounds.volume('bgm') + 0.1)
 
     def turn_down_bgm(self):
-        if c.bgm_volume > 0.1:
-            c.bgm_volume -= 0.1
+        if sounds.volume('bgm') > 0.1:
+            sounds.set_volume('bgm', sounds.volume('bgm') - 0.1)
 
     def turn_up_effect(self):
-        if c.sound_volume < 0.9:
-            c.sound_volume += 0.1
+        """Turn up the sound effects. The ui sounds follow the effect volume."""
+        if sounds.volume('sfx') < 0.9:
+            sounds.set_volume('sfx', sounds.volume('sfx') + 0.1)
+            sounds.set_volume('ui', sounds.volume('sfx'))
 
     def turn_down_effect(self):
-        if c.sound_volume > 0.1:
-            c.sound_volume -= 0.1
+        if sounds.volume('sfx') > 0.1:
+            sounds.set_volume('sfx', sounds.volume('sfx') - 0.1)
+            sounds.set_volume('ui', sounds.volume('sfx'))
 
     def event_loop(self):
         """Set the event loop of the menu."""
@@ -809,12 +787,6 @@ class SettingsMenu(Menu):
             if event.type == pg.QUIT:
                 pg.quit()
                 sys.exit()
-            # Load components.
-            if event.type == self.load_component_event:
-                for i in range(0, len(self.activite_components)):
-                    if not self.activite_components[i]:
-                        self.activite_components[i] = True
-                        break
             # Choose button according to the key.
             if event.type == pg.KEYDOWN:
                 # main menu of settings menu.
@@ -907,10 +879,10 @@ class SettingsMenu(Menu):
                 # Update dynamic text.
                 if sprite is self.dynamic_text01:
                     sprite.update('{0:2}'.format(
-                        str(round(c.bgm_volume * 10))))
+                        str(round(sounds.volume('bgm') * 10))))
                 elif sprite is self.dynamic_text02:
                     sprite.update('{0:2}'.format(
-                        str(round(c.sound_volume * 10))))
+                        str(round(sounds.volume('sfx') * 10))))
                 # Update other bolume group sprites.
                 else:
                     sprite.update()
@@ -920,10 +892,6 @@ class SettingsMenu(Menu):
         # Update archive group sprites.
         if self.submenu_boolean['archive']:
             self.archive_group.update()
-        # Update volume
-        pg.mixer.music.set_volume(c.bgm_volume)
-        self.choose_sound.set_volume(c.sound_volume)
-        self.confirm_sound.set_volume(c.sound_volume)
 
     def draw(self):
         """Draw all components."""
@@ -949,8 +917,7 @@ class SettingsMenu(Menu):
         elif self.submenu_boolean['archive']:
             for sprite in self.archive_group:
                 sprite.draw()
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), self.screen_rect)
+        self.glo.present(self.screen, self.screen_rect)
 
     def main(self):
         self.new()
@@ -979,8 +946,7 @@ class SelectionBox(Menu):
         self.bottom_rect = pg.Rect(
             (c.SCREENWIDTH / 2 - self.size[0] / 2, c.SCREENHEIGHT / 2 - self.size[1] / 2), self.size)
 
-        self.text_surf = self.text_surf = pg.font.Font(
-            font, font_size).render(text, True, c.WHITE)
+        self.text_surf = fonts.render(font, font_size, text, c.WHITE)
         self.text_rect = self.text_surf.get_rect(
             center=(self.bottom_rect.centerx, self.bottom_rect.y + self.bottom_rect.height / 4))
 
@@ -1006,8 +972,7 @@ class SelectionBox(Menu):
         # Set chosen button.
         self.buttons.sprites()[self.chosen_button].chosen = True
         # Set bgm and sounds
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.choose_sound.set_volume(c.sound_volume)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
 
     def confirm(self):
         self.select = True
@@ -1052,13 +1017,12 @@ class SelectionBox(Menu):
         # Draw text.
         self.screen.blit(self.text_surf, self.text_rect)
         # Scale the screen.
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def main_loop(self):
         """the main loop of the menu"""
         while self.main_loop_running:
-            self.dt = self.clock.tick(c.FPS) / 1000
+            self.tick()
             # event loop
             self.event_loop()
             # update items
@@ -1085,16 +1049,16 @@ class SceneSelectionMenu(Menu):
         self.all_sprites = pg.sprite.Group()
         self.buttons = pg.sprite.Group()
         # Add wallpaper.
-        self.wall_paper = pg.transform.scale(
-            pg.image.load(c.SCENESELECTIONWALLPAPER), (c.SCREENWIDTH, c.SCREENHEIGHT))
+        self.wall_paper = assets.image(
+            c.SCENESELECTIONWALLPAPER, (c.SCREENWIDTH, c.SCREENHEIGHT))
         # Add previews.
         self.previews = []
-        self.previews.append(pg.transform.scale(pg.image.load(
-            c.CLIFFPREVIEW), (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
-        self.previews.append(pg.transform.scale(pg.image.load(
-            c.STRINGSTARPREVIEW), (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
-        self.previews.append(pg.transform.scale(pg.image.load(
-            c.INFINITEMODEPREVIEW), (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
+        self.previews.append(assets.image(
+            c.CLIFFPREVIEW, (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
+        self.previews.append(assets.image(
+            c.STRINGSTARPREVIEW, (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
+        self.previews.append(assets.image(
+            c.INFINITEMODEPREVIEW, (int(c.SCREENWIDTH / 4), int(c.SCREENHEIGHT * 2 / 5))))
         # Add selecton buttons.
         Button(self, self.screen, 'cliff', self.level01, c.BACKTO1982,
                15, (c.SCREENWIDTH / 4, c.SCREENHEIGHT / 5), (c.SCREENWIDTH * -1 / 4, 2.5 * c.SCREENHEIGHT), (c.SCREENWIDTH / 16, c.SCREENHEIGHT * 3 / 4))
@@ -1110,14 +1074,11 @@ class SceneSelectionMenu(Menu):
         self.buttons.sprites()[self.chosen_button].chosen = True
         # Set bgm and sounds
         if self.glo.ready_to_play_menu_bgm:
-            pg.mixer.music.load(c.MAINMENUBGM)
-            pg.mixer.music.set_volume(c.bgm_volume)
-            pg.mixer.music.play(loops=-1)
+            sounds.load_music(c.MAINMENUBGM)
+            sounds.play_music()
             self.glo.ready_to_play_menu_bgm = False
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.choose_sound.set_volume(c.sound_volume)
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
 
     def level01(self):
         if self.glo.archive.unlock[0]:
@@ -1184,8 +1145,7 @@ class SceneSelectionMenu(Menu):
             self.screen.blit(
                 self.previews[2], (c.SCREENWIDTH * 11 / 16, c.SCREENHEIGHT / 4))
 
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def fade_draw(self, fade):
         self.screen.blit(self.wall_paper, (0, 0))
@@ -1200,8 +1160,7 @@ class SceneSelectionMenu(Menu):
                 self.previews[2], (c.SCREENWIDTH * 11 / 16, c.SCREENHEIGHT / 4))
         # Draw black surf.
         self.screen.blit(fade, (0, 0))
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def update(self):
         # Update all sprites.
@@ -1221,8 +1180,7 @@ class MessageBox(Menu):
         self.size = (c.SCREENWIDTH / 2, c.SCREENHEIGHT / 2)
         self.bottom_rect = pg.Rect(
             (c.SCREENWIDTH / 2 - self.size[0] / 2, c.SCREENHEIGHT / 2 - self.size[1] / 2), self.size)
-        self.text_surf = self.text_surf = pg.font.Font(
-            font, font_size).render(text, True, c.WHITE)
+        self.text_surf = fonts.render(font, font_size, text, c.WHITE)
         self.text_rect = self.text_surf.get_rect(
             center=(self.bottom_rect.centerx, self.bottom_rect.y + self.bottom_rect.height / 4))
 
@@ -1243,8 +1201,7 @@ class MessageBox(Menu):
         # Set chosen button.
         self.confirm_button.chosen = True
         # Set bgm and sounds
-        self.choose_sound = pg.mixer.Sound(c.CHOOSESOUND)
-        self.choose_sound.set_volume(c.sound_volume)
+        self.choose_sound = sounds.sound(c.CHOOSESOUND, 'ui')
 
     def confirm(self):
         self.select = True
@@ -1271,13 +1228,12 @@ class MessageBox(Menu):
         # Draw text.
         self.screen.blit(self.text_surf, self.text_rect)
         # Scale the screen.
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def main_loop(self):
         """the main loop of the menu"""
         while self.main_loop_running:
-            self.dt = self.clock.tick(c.FPS) / 1000
+            self.tick()
             # event loop
             self.event_loop()
             # update items
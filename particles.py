@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+import numpy as np
+import pygame as pg
+from constants import PARTICLECAPACITY, SCREENWIDTH, SCREENHEIGHT
+from physics import round_half_away
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class ParticleSystem:
+    """Square particles stored in a fixed-capacity pool of NumPy arrays.
+       The live particles are packed in the front of the arrays. All of them are integrated,
+       collided with the walls of the collision grid and drawn in batch. New particles are dropped when the pool is full."""
+
+    MINSIZE = 3
+    MAXSIZE = 10
+    TIMERSPEED = 0.2  # How much life a particle loses every frame.
+
+    def __init__(self, scene, capacity=PARTICLECAPACITY) -> None:
+        self.scene = scene
+        self.walls = None  # the collision grid of the walls the particles bounce on
+        self.capacity = capacity
+        self.amount = 0  # the amount of live particles
+        # counters for tuning the capacity
+        self.high_water = 0  # the largest amount so far
+        self.dropped = 0  # the particles not emitted because the system was full
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))  # the position before the last update
+        self.vel = np.zeros((capacity, 2))
+        self.gravity = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # index of self.colors
+        # Pre-made square surfaces. self.squares[color][size] is a square of the color and size.
+        self.colors = {}  # color: color index
+        self.squares = []
+        self.rng = np.random.default_rng()
+
+    def seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def color_index(self, color):
+        """Get the index of the color. The squares of a new color are made here."""
+        index = self.colors.get(color)
+        if index is None:
+            index = len(self.squares)
+            self.colors[color] = index
+            squares = []
+            for size in range(self.MAXSIZE + 1):
+                square = pg.Surface((max(size, 1), max(size, 1))).convert()
+                square.fill(color)
+                squares.append(square)
+            self.squares.append(squares)
+        return index
+
+    def emit(self, x, y, colors, amount, vel_x, vel_y, gravity):
+        """Create particles at (x, y).
+            colors: each particle takes one of the colors at random
+            vel_x, vel_y: (min, max) of the initial velocity
+            gravity: the velocity added every frame(at 60 FPS)"""
+        room = self.capacity - self.amount
+        if amount > room:
+            self.dropped += amount - room
+            amount = room
+        if amount <= 0:
+            return
+        palette = np.array([self.color_index(color) for color in colors])
+        s = slice(self.amount, self.amount + amount)
+        self.pos[s] = self.prev_pos[s] = x, y
+        self.vel[s, 0] = self.rng.uniform(vel_x[0], vel_x[1], amount)
+        self.vel[s, 1] = self.rng.uniform(vel_y[0], vel_y[1], amount)
+        self.gravity[s] = gravity
+        self.life[s] = self.rng.integers(10, 21, amount)
+        self.size[s] = self.rng.integers(self.MINSIZE, self.MAXSIZE + 1, amount)
+        self.color[s] = palette[self.rng.integers(0, len(palette), amount)]
+        self.amount += amount
+        self.high_water = max(self.high_water, self.amount)
+
+    def set_walls(self, walls):
+        """Set the collision grid of the walls."""
+        self.walls = walls
+
+    def collide_with_walls(self, n, axis):
+        """Move the particles that overlap a wall out of it along the axis and reverse their velocity.
+            Only the walls in the cells of each particle are tested."""
+        grid = self.walls
+        if grid is None or len(grid) == 0:
+            return
+        # The particle rects are rounded like pg.Rect.
+        left, top = round_half_away(self.pos[:n]).T
+        size = self.size[:n]
+        first = grid.first_hits(left, top, left + size, top + size)
+        hit = first >= 0
+        if not hit.any():
+            return
+        index = np.flatnonzero(hit)
+        edges = grid.edges[first[hit]]  # the first wall hit like spritecollide
+        vel = self.vel[index, axis]
+        pos = self.pos[index, axis]
+        pos = np.where(vel > 0, edges[:, axis] - self.size[index], pos)
+        pos = np.where(vel < 0, edges[:, axis + 2], pos)
+        self.pos[index, axis] = pos
+        self.vel[index, axis] = -vel
+
+    def update(self):
+        """Integrate all particles, bounce them on the walls and remove the dead ones."""
+        n = self.amount
+        if n == 0:
+            return
+        self.prev_pos[:n] = self.pos[:n]
+        dt = self.scene.sim.dt
+        self.vel[:n, 1] += self.gravity[:n] * dt * 60
+        # Move along x first and then y, so a particle slides along the wall it hits.
+        self.pos[:n, 0] += self.vel[:n, 0] * dt
+        self.collide_with_walls(n, 0)
+        self.pos[:n, 1] += self.vel[:n, 1] * dt
+        self.collide_with_walls(n, 1)
+        # Remove the dead particles by packing the live ones to the front.
+        alive = self.life[:n] >= 0
+        if not alive.all():
+            k = int(alive.sum())
+            for array in (self.pos, self.prev_pos, self.vel, self.gravity, self.life, self.size, self.color):
+                array[:k] = array[:n][alive]
+            n = self.amount = k
+        self.life[:n] -= self.TIMERSPEED * dt * 60
+
+    def draw(self, surface, camera, alpha=1):
+        """Draw the particles on the screen with one blits call.
+            alpha is how far the rendered frame is between the last two updates(0 to 1)."""
+        n = self.amount
+        if n == 0:
+            return
+        pos = self.prev_pos[:n] + (self.pos[:n] - self.prev_pos[:n]) * alpha
+        x = np.rint(pos[:, 0]).astype(np.int64) + int(camera.x)
+        y = np.rint(pos[:, 1]).astype(np.int64) + int(camera.y)
+        size = self.size[:n]
+        visible = np.flatnonzero((x + size > 0) & (x < SCREENWIDTH) &
+                                 (y + size > 0) & (y < SCREENHEIGHT))
+        squares = self.squares
+        surface.blits([(squares[color][size], (px, py)) for color, size, px, py in zip(
+            self.color[visible].tolist(), size[visible].tolist(), x[visible].tolist(), y[visible].tolist())], False)
+
+    def clear(self):
+        self.amount = 0
+
+    def __len__(self):
+        return self.amount
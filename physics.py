@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+import numpy as np
+from constants import PHYSICSCAPACITY
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# body kinds
+PLAYERBODY = 0
+KNIGHTBODY = 1
+FIREBALLBODY = 2
+
+# How each kind reacts to walls: (bounce x, bounce y, friction).
+# The velocity of the hit axis is reversed and multiplied by the bounce.
+# The velocity of the other axis is multiplied by the friction.
+RESTITUTION = {PLAYERBODY: (0, 0, 1),  # The player stops.
+               KNIGHTBODY: (1, 0, 1),  # Knights turn around.
+               FIREBALLBODY: (4 / 5, 4 / 5, 4 / 5)}  # Fire balls bounce.
+
+
+def per_step(rate, dt):
+    """Convert a rate applied once a frame at 60 FPS(like "lose 1/10 of the speed") to a step of dt(s)."""
+    return 1 - (1 - rate) ** (dt * 60)
+
+
+def round_half_away(a):
+    """Round like pg.Rect does when a float is assigned to it."""
+    return np.trunc(a + np.copysign(0.5, a)).astype(np.int64)
+
+
+class PhysicsWorld:
+    """All dynamic bodies of a scene in contiguous arrays.
+       A sprite gets a body by add() and keeps views of its row of self.pos and self.vel as
+       its own pos and vel, so the sprite changes its velocity in place and the world moves it.
+       step() applies gravity, moves the bodies and resolves the walls along x and then y for all
+       active bodies at once. Then every moved sprite reads back its rects by read_body()."""
+
+    def __init__(self, capacity=PHYSICSCAPACITY) -> None:
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))  # the position before the last step
+        self.vel = np.zeros((capacity, 2))
+        self.rect = np.zeros((capacity, 2), dtype=np.int64)  # topleft of the body rect
+        self.size = np.zeros((capacity, 2), dtype=np.int64)
+        self.gravity = np.zeros(capacity)
+        self.bounce = np.zeros((capacity, 2))
+        self.friction = np.zeros(capacity)
+        self.invisible = np.zeros(capacity, dtype=bool)  # if it collides with invisible walls
+        self.active = np.zeros(capacity, dtype=bool)  # if it's moved by step()
+        self.used = np.zeros(capacity, dtype=bool)
+        # contacts of the last step
+        self.airborne = np.zeros(capacity, dtype=bool)  # falling faster than 2 * gravity
+        self.landed = np.zeros(capacity, dtype=bool)  # hit a wall below while falling
+        self.hit_x = np.zeros(capacity, dtype=np.int8)  # 1: hit a wall on the right, -1: on the left
+        self.owners = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.walls = None
+        self.invisible_walls = None
+
+    def set_walls(self, walls, invisible_walls):
+        """Set the collision grids of the walls and the invisible walls."""
+        self.walls = walls
+        self.invisible_walls = invisible_walls
+
+    def add(self, owner, kind, pos, size, gravity, vel=(0, 0), invisible=False, active=True):
+        """Add a body. Its owner gets pos and vel as views of the arrays.
+            size: the size of the body rect
+            invisible: if the body collides with the invisible walls"""
+        if not self.free:
+            self.grow()
+        body = self.free.pop()
+        self.used[body] = True
+        self.active[body] = active
+        self.pos[body] = self.prev_pos[body] = pos
+        self.vel[body] = vel
+        self.size[body] = size
+        self.rect[body] = round_half_away(self.pos[body])
+        self.gravity[body] = gravity
+        bounce_x, bounce_y, friction = RESTITUTION[kind]
+        self.bounce[body] = bounce_x, bounce_y
+        self.friction[body] = friction
+        self.invisible[body] = invisible
+        self.airborne[body] = self.landed[body] = False
+        self.hit_x[body] = 0
+        self.owners[body] = owner
+        self.bind(body)
+        return body
+
+    def bind(self, body):
+        owner = self.owners[body]
+        owner.pos = self.pos[body]
+        owner.vel = self.vel[body]
+
+    def remove(self, body):
+        """Remove the body. Removing a removed body does nothing."""
+        if self.used[body]:
+            self.used[body] = False
+            self.active[body] = False
+            self.owners[body] = None
+            self.free.append(body)
+
+    def grow(self):
+        """Double the capacity. The owners are bound to the new arrays."""
+        old = self.capacity
+        self.capacity *= 2
+        for name in ('pos', 'prev_pos', 'vel', 'rect', 'size', 'gravity', 'bounce', 'friction', 'invisible',
+                     'active', 'used', 'airborne', 'landed', 'hit_x'):
+            array = getattr(self, name)
+            grown = np.zeros((self.capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.owners += [None] * old
+        self.free = list(range(self.capacity - 1, old - 1, -1)) + self.free
+        for body in np.flatnonzero(self.used):
+            self.bind(body)
+
+    def collide(self, bodies, axis, grid):
+        """Push the bodies out of the walls of the grid along the axis."""
+        if len(bodies) == 0 or len(grid) == 0:
+            return
+        left, top = self.rect[bodies, 0], self.rect[bodies, 1]
+        first = grid.first_hits(left, top, left + self.size[bodies, 0],
+                                top + self.size[bodies, 1])
+        hit = first >= 0
+        if not hit.any():
+            return
+        bodies = bodies[hit]
+        edges = grid.edges[first[hit]]
+        vel = self.vel[bodies, axis]
+        pos = self.pos[bodies, axis]
+        # Moving right(down) puts the body before the near edge, moving left(up) after the far one.
+        pos = np.where(vel > 0, edges[:, axis] - self.size[bodies, axis], pos)
+        pos = np.where(vel < 0, edges[:, axis + 2], pos)
+        self.pos[bodies, axis] = pos
+        self.rect[bodies, axis] = round_half_away(pos)
+        other = 1 - axis
+        self.vel[bodies, axis] = -vel * self.bounce[bodies, axis]
+        self.vel[bodies, other] *= self.friction[bodies]
+        if axis == 0:
+            moving = vel != 0
+            self.hit_x[bodies[moving]] = np.sign(vel[moving])
+        else:
+            self.landed[bodies[vel > 0]] = True
+
+    def step(self, dt):
+        """Move all active bodies and let their owners read back the result."""
+        self.prev_pos[:] = self.pos
+        bodies = np.flatnonzero(self.active)
+        if len(bodies) == 0:
+            return
+        self.landed[bodies] = False
+        self.hit_x[bodies] = 0
+        # gravity
+        self.vel[bodies, 1] += self.gravity[bodies] * dt * 60
+        self.airborne[bodies] = self.vel[bodies, 1] > 2 * self.gravity[bodies]
+        self.pos[bodies] += self.vel[bodies] * dt
+        invisible = bodies[self.invisible[bodies]]
+        # Resolve x first, then y, so the bodies slide along the walls.
+        for axis in (0, 1):
+            self.rect[bodies, axis] = round_half_away(self.pos[bodies, axis])
+            self.collide(bodies, axis, self.walls)
+            self.collide(invisible, axis, self.invisible_walls)
+        owners = self.owners
+        for body in bodies.tolist():
+            owners[body].read_body()
+
+    def lag(self, alpha):
+        """Get how far each body is drawn behind its position, as a list of (dx, dy).
+            alpha is how far the rendered frame is between the last two steps(0 to 1)."""
+        return ((self.pos - self.prev_pos) * (alpha - 1)).tolist()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class SpritePool:
+    """Sprites that have left the scene, kept to be set up again instead of creating new ones.
+       The sprites must have reset(*args), which sets a sprite up like a new one with the
+       arguments of the factory, and retire(), which removes it from the scene.
+       Counters for tuning:
+           size: the amount of sprites the pool has created
+           in_use: the amount of sprites in the scene
+           high_water: the largest in_use so far"""
+
+    def __init__(self, factory) -> None:
+        self.factory = factory  # factory(*args) creates a new sprite.
+        self.free = []
+        self.size = 0
+        self.in_use = 0
+        self.high_water = 0
+        self.reused = 0
+
+    def prewarm(self, amount, *args):
+        """Create sprites in advance, so the first ones acquired are not created during the game."""
+        for _ in range(amount):
+            sprite = self.factory(*args)
+            sprite.retire()
+            self.free.append(sprite)
+            self.size += 1
+
+    def acquire(self, *args):
+        """Get a sprite set up by the arguments. A free sprite is reused if there is one."""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.factory(*args)
+            self.size += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return sprite
+
+    def release(self, sprite):
+        """Take the sprite out of the scene and keep it. Releasing a released sprite does nothing."""
+        if sprite.alive():
+            sprite.retire()
+            self.free.append(sprite)
+            self.in_use -= 1
+
+    def stats(self):
+        return {'size': self.size, 'free': len(self.free), 'in_use': self.in_use,
+                'high_water': self.high_water, 'reused': self.reused}
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+import pygame as pg
+from constants import SCREENWIDTH, SCREENHEIGHT
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class SoftwarePresenter:
+    """Scale the screen surface on the CPU and blit it to a display of the window size."""
+
+    def __init__(self, width, height) -> None:
+        self.display = None
+        self.scaled_screen = None
+        self.set_size(width, height)
+
+    def set_size(self, width, height, full_screen=False):
+        """Set the window size. Return the display surface."""
+        if full_screen:
+            self.display = pg.display.set_mode((width, height), pg.FULLSCREEN)
+        else:
+            self.display = pg.display.set_mode((width, height))
+        # The scaled screen is reused by every frame.
+        self.scaled_screen = pg.Surface((width, height)).convert()
+        return self.display
+
+    def present(self, screen, pos=(0, 0)):
+        """Scale the screen to the window size and blit it at pos(window pixels)."""
+        pg.transform.scale(
+            screen, self.scaled_screen.get_size(), self.scaled_screen)
+        self.display.blit(self.scaled_screen, pos)
+
+
+class ScaledPresenter:
+    """Let the SDL renderer scale the screen to the window size.
+       The display surface is as large as the screen. pygame uploads it to a streaming
+       texture when the display is updated and the renderer scales it on the GPU."""
+
+    def __init__(self, width, height) -> None:
+        # The window of the display comes from a private module, so only this presenter needs it.
+        from pygame._sdl2.video import Window
+        self.display = pg.display.set_mode((SCREENWIDTH, SCREENHEIGHT), pg.SCALED)
+        self.window = Window.from_display_module()
+        self.width = width
+        self.height = height
+        self.set_size(width, height)
+
+    def set_size(self, width, height, full_screen=False):
+        """Resize the window without creating a new display surface. Return the display surface."""
+        if full_screen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            self.window.size = (width, height)
+        self.width = width
+        self.height = height
+        return self.display
+
+    def present(self, screen, pos=(0, 0)):
+        """Blit the screen to the display. pos is in window pixels like the software presenter."""
+        self.display.blit(screen, (pos[0] * SCREENWIDTH / self.width,
+                                   pos[1] * SCREENHEIGHT / self.height))
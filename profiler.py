@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+import time
+import numpy as np
+import pygame as pg
+import constants as c
+from assets import assets, fonts
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# the phases of a frame and their colors in the graph
+PHASECOLORS = {'events': (255, 200, 0), 'update': (0, 200, 255), 'particles': (255, 80, 200),
+               'map': (120, 220, 80), 'sprites': (255, 120, 40), 'other': (170, 170, 170),
+               'scale': (140, 100, 255), 'flip': (255, 255, 255)}
+
+
+class Profiler:
+    """The frame profiler of a battle scene, shown as an overlay.
+       When it's enabled, the methods of the phases are replaced by timed ones on the instances,
+       and the time spent in each phase every frame is kept in a ring buffer of the last
+       PROFILERFRAMES frames. A phase called in another one is not counted in the outer one, so
+       'other' is the part of draw_components() out of the map, sprites and particles.
+       When it's disabled, the instance attributes are removed, so the scene runs untouched."""
+
+    def __init__(self, scene) -> None:
+        self.scene = scene
+        self.phases = list(PHASECOLORS)
+        self.enabled = False
+        self.samples = np.zeros((c.PROFILERFRAMES, len(self.phases)))  # ring buffer(ms)
+        self.frame = 0  # the amount of frames recorded
+        self.current = np.zeros(len(self.phases))  # the frame being recorded
+        self.stack = []  # the time of the phases called in the running phases(s)
+        self.wrapped = []  # (object, method name)
+        self.font = None
+        self.last_tests = 0
+
+    def targets(self):
+        """Get (phase, object, method name) of the timed methods."""
+        scene = self.scene
+        return [('events', scene, 'event_loop'), ('update', scene, 'update'),
+                ('particles', scene, 'update_particles'), ('particles', scene.particles, 'draw'),
+                ('map', scene.map_chunks, 'draw'), ('sprites', scene, 'draw_sprites'),
+                ('other', scene, 'draw_components'), ('scale', scene, 'scale_screen'),
+                ('flip', scene, 'flip')]
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.frame = 0
+        self.current[:] = 0
+        self.stack = []
+        self.font = fonts.font(c.BACKTO1982, 10)
+        for phase, obj, name in self.targets():
+            # The frame ends when the display is flipped.
+            setattr(obj, name, self.timed(self.phases.index(phase), getattr(obj, name),
+                                          name == 'flip'))
+            self.wrapped.append((obj, name))
+        # The overlay is drawn on top of the scene, right before it's scaled.
+        scale = self.scene.scale_screen
+        def scale_screen():
+            self.draw()
+            scale()
+        self.scene.scale_screen = scale_screen
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        # It may be disabled from a timed phase, so the stack is left for its wrapper to pop.
+        for obj, name in self.wrapped:
+            delattr(obj, name)
+        self.wrapped = []
+
+    def timed(self, column, method, ends_frame=False):
+        def wrapper(*args, **kwargs):
+            begin = time.perf_counter()
+            self.stack.append(0.0)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - begin
+                inner = self.stack.pop() if self.stack else 0.0
+                self.current[column] += (elapsed - inner) * 1000
+                if self.stack:
+                    self.stack[-1] += elapsed
+                if ends_frame:
+                    self.end_frame()
+        return wrapper
+
+    def end_frame(self):
+        """Keep the frame in the ring buffer."""
+        self.samples[self.frame % c.PROFILERFRAMES] = self.current
+        self.current[:] = 0
+        self.frame += 1
+
+    def recent(self):
+        """Get the recorded frames from the oldest to the latest."""
+        if self.frame < c.PROFILERFRAMES:
+            return self.samples[:self.frame]
+        return np.roll(self.samples, -(self.frame % c.PROFILERFRAMES), axis=0)
+
+    def counters(self):
+        """Get the live counters of the scene."""
+        scene = self.scene
+        tests = scene.combat.tests()
+        tests, self.last_tests = tests - self.last_tests, tests
+        return [('sprites drawn', len(scene.all_sprites)),
+                ('particles alive', scene.particles.amount),
+                ('combat tests', tests),
+                ('image cache', '%d%%' % (assets.hit_rate() * 100)),
+                ('text cache', '%d%%' % (fonts.hit_rate() * 100))]
+
+    def draw(self):
+        """Draw the frame time graph, the mean time of the phases and the counters."""
+        screen = self.scene.screen
+        frames = self.recent()
+        width, height = c.PROFILERFRAMES, c.PROFILERHEIGHT
+        panel = pg.Surface((width + 160, height))
+        panel.set_alpha(200)
+        # One bar a frame, the phases stacked from the bottom. PROFILERSCALE pixels a ms.
+        target = height - 1000 / c.FPS * c.PROFILERSCALE
+        for x, frame in enumerate(frames):
+            y = height
+            for column, phase in enumerate(self.phases):
+                top = y - frame[column] * c.PROFILERSCALE
+                if y - top >= 1:
+                    pg.draw.line(panel, PHASECOLORS[phase], (x, max(top, 0)), (x, y - 1))
+                y = top
+        # the frame time of the FPS
+        pg.draw.line(panel, c.RED, (0, target), (width, target))
+        means = frames.mean(axis=0) if len(frames) else self.current
+        lines = [('frame', '%.2f ms' % means.sum())]
+        lines += [(phase, '%.2f' % mean) for phase, mean in zip(self.phases, means)]
+        lines += self.counters()
+        y = 2
+        for label, value in lines:
+            color = PHASECOLORS.get(label, c.WHITE)
+            panel.blit(self.font.render('%s %s' % (label, value), False, color), (width + 6, y))
+            y += 11
+        screen.blit(panel, (0, c.SCREENHEIGHT - height))
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+import argparse
+import atexit
+import hashlib
+import json
+import random
+import struct
+import pygame as pg
+import constants as c
+from clocks import SimClock
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+# the keys read by pg.key.get_pressed() in the scenes, one bit each in the log
+RECORDEDKEYS = (c.K_a, c.K_d, c.K_k, c.K_j)
+# the events the scenes react to
+RECORDEDEVENTS = (pg.KEYDOWN, pg.KEYUP, pg.QUIT)
+# the keys that give the held commands of a controller
+COMMANDKEYS = (('left', c.K_a), ('right', c.K_d), ('jump', c.K_k), ('attack', c.K_j))
+# the header of an input log and its format version
+MAGIC = b'TKIN'
+VERSION = 2
+# records of an input log
+SCENERECORD = b'S'  # a scene begins: name, player position, seed, simulation rate, options
+TICKRECORD = b'T'  # a step: the key mask and the events
+REPEATRECORD = b'R'  # steps with the key mask of the last step and no events
+CHOICERECORD = b'C'  # the answer of a menu shown by the scene, as JSON
+ENDRECORD = b'E'  # the scene ends: the amount of steps and the digest of the state
+
+
+def state_digest(scene):
+    """Get a digest of the simulation state of a battle scene."""
+    digest = hashlib.sha1()
+    digest.update(struct.pack('<dii', scene.sim.ticks, scene.player.hv,
+                              scene.player.fire_ball_amount))
+    physics = scene.physics
+    for array in (physics.pos, physics.vel, scene.enemy_manager.hv, scene.enemy_manager.used):
+        digest.update(array.tobytes())
+    digest.update(scene.particles.pos[:scene.particles.amount].tobytes())
+    return digest.digest()
+
+
+class KeyState:
+    """The state of the recorded keys, indexed like the result of pg.key.get_pressed()."""
+
+    def __init__(self, mask) -> None:
+        self.mask = mask
+
+    @classmethod
+    def from_pressed(cls, pressed):
+        mask = 0
+        for bit, key in enumerate(RECORDEDKEYS):
+            if pressed[key]:
+                mask |= 1 << bit
+        return cls(mask)
+
+    @classmethod
+    def from_controller(cls, controller):
+        """Get the keys that give the held commands of the controller."""
+        mask = 0
+        for command, key in COMMANDKEYS:
+            if getattr(controller, command):
+                mask |= 1 << RECORDEDKEYS.index(key)
+        return cls(mask)
+
+    def __getitem__(self, key):
+        if key not in RECORDEDKEYS:
+            return False
+        return bool(self.mask >> RECORDEDKEYS.index(key) & 1)
+
+
+class LiveInput:
+    """The input of a scene, read once every step of the simulation.
+       The scenes read the keyboard and the events through it, so it can be recorded and
+       replayed. Menus shown by a scene are asked through choose()."""
+
+    def __init__(self) -> None:
+        self.keys = KeyState(0)
+        self.tick_events = []
+
+    def begin_scene(self, scene):
+        """Get the seed of the random numbers of the scene, or None for a random game."""
+        return None
+
+    def begin_tick(self):
+        self.keys = KeyState.from_pressed(pg.key.get_pressed())
+        self.tick_events = [event for event in pg.event.get() if event.type in RECORDEDEVENTS]
+
+    def record_tick(self, controller):
+        """Keep the commands the controller decided in this step."""
+        pass
+
+    def pressed(self):
+        return self.keys
+
+    def events(self):
+        return self.tick_events
+
+    def choose(self, menu):
+        """Show the menu(its main method) and return the answer."""
+        return menu()
+
+    def end_scene(self, scene):
+        pass
+
+    def close(self):
+        pass
+
+
+def fire_ball_events(controller):
+    """Get the (type, key) events of the fire ball key that give the fire ball commands of the
+        controller in this step."""
+    events = []
+    if controller.fire_pressed:
+        events.append((pg.KEYDOWN, c.K_l))
+    if controller.fire_released:
+        # If the key is held at the end of the step, it was released before it was pressed again.
+        events.insert(0 if controller.fire else len(events), (pg.KEYUP, c.K_l))
+    return events
+
+
+class InputRecorder(LiveInput):
+    """Live input written to a binary log, one record per step. The keys are the commands of
+       the controller of the scene, so a log played by the bot is replayed like any other.
+       The steps that repeat the keys of the last step without events are run-length encoded."""
+
+    def __init__(self, path) -> None:
+        super().__init__()
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC + struct.pack('<B', VERSION))
+        # The game quits by sys.exit(), so the log is closed at exit.
+        atexit.register(self.close)
+        self.last_mask = None
+        self.repeats = 0
+        self.ticks = 0
+
+    def begin_scene(self, scene):
+        seed = random.getrandbits(32)
+        name = type(scene).__name__.encode()
+        player_pos = scene.player_pos.encode()
+        options = json.dumps(scene.options()).encode()
+        self.file.write(SCENERECORD + struct.pack('<B', len(name)) + name +
+                        struct.pack('<B', len(player_pos)) + player_pos +
+                        struct.pack('<IH', seed, c.SIMULATIONRATE) +
+                        struct.pack('<H', len(options)) + options)
+        self.last_mask = None
+        self.repeats = 0
+        self.ticks = 0
+        return seed
+
+    def record_tick(self, controller):
+        # The commands are recorded as the keys that give them, so the log is replayed by the
+        # keyboard controller whichever controller played it.
+        self.ticks += 1
+        mask = KeyState.from_controller(controller).mask
+        events = fire_ball_events(controller) + [
+            (event.type, getattr(event, 'key', 0)) for event in self.tick_events
+            if getattr(event, 'key', None) != c.K_l]
+        if mask == self.last_mask and not events:
+            self.repeats += 1
+            return
+        self.write_repeats()
+        self.file.write(TICKRECORD + struct.pack('<HB', mask, len(events)))
+        for type, key in events:
+            self.file.write(struct.pack('<II', type, key))
+        self.last_mask = mask
+
+    def write_repeats(self):
+        if self.repeats:
+            self.file.write(REPEATRECORD + struct.pack('<I', self.repeats))
+            self.repeats = 0
+
+    def choose(self, menu):
+        answer = menu()
+        self.write_repeats()
+        data = json.dumps(answer).encode()
+        self.file.write(CHOICERECORD + struct.pack('<H', len(data)) + data)
+        return answer
+
+    def end_scene(self, scene):
+        self.write_repeats()
+        self.file.write(ENDRECORD + struct.pack('<I', self.ticks) + state_digest(scene))
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.write_repeats()
+            self.file.close()
+
+
+class RecordedScene:
+    """The input of a scene read from a log."""
+
+    def __init__(self, name, player_pos, seed, rate, options) -> None:
+        self.name = name
+        self.player_pos = player_pos
+        self.seed = seed
+        self.rate = rate
+        self.options = options  # the keyword arguments of the scene, like the horde settings
+        self.ticks = []  # (key mask, [(event type, key)])
+        self.choices = []
+        self.digest = None  # None if the log ends before the scene
+
+
+def read_log(path):
+    """Read the scenes of an input log."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    # The logs of version 1 have no scene options.
+    version = data[4]
+    if data[:4] != MAGIC or version not in (1, VERSION):
+        raise ValueError('%s is not an input log of version %d' % (path, VERSION))
+    scenes = []
+    i = 5
+    while i < len(data):
+        record, i = data[i:i + 1], i + 1
+        if record == SCENERECORD:
+            name, i = data[i + 1:i + 1 + data[i]].decode(), i + 1 + data[i]
+            player_pos, i = data[i + 1:i + 1 + data[i]].decode(), i + 1 + data[i]
+            seed, rate = struct.unpack_from('<IH', data, i)
+            i += 6
+            options = {}
+            if version > 1:
+                size, = struct.unpack_from('<H', data, i)
+                options = json.loads(data[i + 2:i + 2 + size])
+                i += 2 + size
+            scenes.append(RecordedScene(name, player_pos, seed, rate, options))
+        elif record == TICKRECORD:
+            mask, amount = struct.unpack_from('<HB', data, i)
+            i += 3
+            events = [struct.unpack_from('<II', data, i + 8 * n) for n in range(amount)]
+            i += 8 * amount
+            scenes[-1].ticks.append((mask, events))
+        elif record == REPEATRECORD:
+            repeats, = struct.unpack_from('<I', data, i)
+            i += 4
+            scenes[-1].ticks += [(scenes[-1].ticks[-1][0], [])] * repeats
+        elif record == CHOICERECORD:
+            size, = struct.unpack_from('<H', data, i)
+            scenes[-1].choices.append(json.loads(data[i + 2:i + 2 + size]))
+            i += 2 + size
+        elif record == ENDRECORD:
+            i += 4
+            scenes[-1].digest, i = data[i:i + 20], i + 20
+        else:
+            raise ValueError('Unknown record %r at byte %d of %s' % (record, i - 1, path))
+    return scenes
+
+
+class InputReplay(LiveInput):
+    """The input of a recorded scene fed back step by step. The menus aren't shown:
+       their recorded answers are returned instead."""
+
+    def __init__(self, recorded) -> None:
+        super().__init__()
+        self.recorded = recorded
+        self.tick = 0
+        self.choices = list(recorded.choices)
+
+    def begin_scene(self, scene):
+        return self.recorded.seed
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.recorded.ticks)
+
+    def begin_tick(self):
+        if self.finished:
+            self.keys, self.tick_events = KeyState(0), []
+            return
+        mask, events = self.recorded.ticks[self.tick]
+        self.keys = KeyState(mask)
+        self.tick_events = [pg.event.Event(type, key=key) for type, key in events]
+        self.tick += 1
+
+    def choose(self, menu):
+        return self.choices.pop(0)
+
+
+def replay_scene(control, recorded, render=True, realtime=True, on_frame=None):
+    """Run the recorded steps in a new scene. Return if the state matches the recording,
+        or None if the recording has no digest.
+        on_frame(scene, frame) is called after each frame is drawn, before it's shown."""
+    glo = control.glo
+    glo.next_scene = [recorded.name, recorded.player_pos]
+    replay = InputReplay(recorded)
+    glo.input = replay
+    # The log names the scenes by their classes.
+    from tools import SCENES
+    scene_class, map_path = {scene_class.__name__: (scene_class, map_path)
+                             for scene_class, map_path in SCENES.values()}[recorded.name]
+    options = dict(recorded.options)
+    if recorded.name == 'HordeModeCliff':
+        # A replay doesn't overwrite the statistics of the game.
+        options['stats_path'] = None
+    scene = scene_class(control.clock, control.screen, glo.display, glo, 1.5, **options)
+    # The steps must be as long as the recorded ones.
+    scene.sim = SimClock(recorded.rate)
+    scene.load_data(map_path)
+    scene.new()
+    # the steps drawn in one frame
+    steps_per_frame = max(recorded.rate // c.FPS, 1)
+    frame_time = steps_per_frame / recorded.rate
+    while not replay.finished:
+        scene.step()
+        if render and replay.tick % steps_per_frame == 0:
+            scene.update_view(frame_time)
+            scene.draw()
+            if on_frame is not None:
+                on_frame(scene, replay.tick // steps_per_frame)
+            scene.flip()
+            if realtime:
+                control.clock.tick(c.FPS)
+    if recorded.digest is None:
+        return None
+    return state_digest(scene) == recorded.digest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Replay an input log recorded by theKnight.py --record.')
+    parser.add_argument('log', help='the input log')
+    parser.add_argument('--headless', action='store_true',
+                        help='run the steps without drawing them')
+    parser.add_argument('--fast', action='store_true',
+                        help="don't wait for the frames")
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    from tools import headless_control
+    control = headless_control(not args.headless)
+    for recorded in read_log(args.log):
+        matched = replay_scene(control, recorded, not args.headless, not args.fast)
+        result = {True: 'reproduced', False: 'diverged', None: 'not finished in the log'}[matched]
+        print('%s: %d steps, %s' % (recorded.name, len(recorded.ticks), result))
+    pg.quit()
@@ -1,11 +1,27 @@
 #!/usr/bin/env python
 import sys
+import time
+import random
+from random import sample, randint
 import constants as c
 from sprites import *
 from tilemap import *
 from buttons import Text
 from menus import SettingsMenu, SelectionBox
 from backgrounds import Background
+from assets import assets
+from hud import Hud
+from sounds import sounds
+from particles import ParticleSystem
+from physics import PhysicsWorld
+from enemies import EnemyManager
+from pools import SpritePool
+from animation import Animator
+from scheduler import Scheduler
+from clocks import SimClock, RealtimeClock
+from stats import WaveStats, save_json
+from profiler import Profiler
+from combat import CombatResolver, FIREBALLHIT, PLAYERSLASH, BODYCOLLISION
 
 
 class Scene:
@@ -23,16 +39,70 @@ class Scene:
         self.display = display
         self.glo = glo
         self.player_pos = glo.next_scene[1]
+        # the keyboard and the events, live, recorded or replayed
+        self.input = glo.input
+        # the commands of the player, from the input or a bot
+        self.controller = glo.controller(self)
+        # The timers of the scene run on the scene clock.
+        self.scheduler = Scheduler()
+        self.now = 0  # the scene clock(ms)
+        # The simulation runs in fixed steps. The frames are drawn between the last two steps.
+        self.sim = SimClock()
+        # The frames are paced by the wall clock unless it's replaced by a VirtualClock.
+        self.frame_clock = RealtimeClock(clock)
+        # If it's false, the frames are simulated without being drawn.
+        self.render = True
+
+    def tick(self):
+        """Wait for the next frame. Return the time of the frame(s)."""
+        return self.frame_clock.tick()
+
+    def options(self):
+        """Get the keyword arguments the scene was created with besides the common ones."""
+        return {}
+
+    def advance_clock(self, ticks):
+        """Advance the scene clock to the ticks(ms) and fire the due timers."""
+        self.now = self.scheduler.update(ticks)
+
+    def simulate(self, frame_time):
+        """Run as many steps as the time of the frame(s) covers. The rest is kept for the next frame.
+            Return the amount of steps."""
+        self.sim.add_frame(frame_time)
+        steps = 0
+        while self.sim.due() and self.next_scene is None:
+            self.step()
+            steps += 1
+        self.sim.end_frame()
+        return steps
+
+    def step(self):
+        """Simulate one step: the input, the timers, the events and the update of the scene."""
+        self.input.begin_tick()
+        self.controller.begin_tick()
+        self.input.record_tick(self.controller)
+        self.advance_clock(self.sim.step())
+        self.event_loop()
+        self.update()
+
+    def run_frame(self):
+        """Simulate a frame, and draw it unless the rendering is off."""
+        frame_time = self.tick()
+        # Simulate the time of the frame in fixed steps.
+        self.simulate(frame_time)
+        if self.render:
+            self.update_view(frame_time)
+            # draw items
+            self.draw()
+            # update screen
+            self.flip()
 
     def load_data(self, map_path):
         """Load data from files, tile map for instance."""
         self.map = TiledMap(map_path)
-        self.map_img = self.map.make_map()
-        # Scaled
-        self.map_rect = self.map_img.get_rect()
-        self.map_img = pg.transform.scale(
-            self.map_img, (int(self.size_multiplier * self.map_rect.width), int(self.size_multiplier * self.map_rect.height)))
-        self.map_rect = self.map_img.get_rect()
+        # Split the scaled map into chunks.
+        self.map_chunks = ChunkedMap(self.map, self.size_multiplier)
+        self.map_rect = self.map_chunks.rect
 
     def new(self):
         """Ininialize all componenets in the scene."""
@@ -44,44 +114,50 @@ class Scene:
         fade.fill(c.BLACK)
         for alpha in range(255, 0, -10):
             fade.set_alpha(alpha)  # accumulative
-            self.dt = self.clock.tick(FPS) / 1000
-            self.event_loop()
+            frame_time = self.tick()
             # Update
-            self.update()
+            self.simulate(frame_time)
+            if not self.render:
+                continue
+            self.update_view(frame_time)
             # Draw components
             self.fade_draw(fade)
             # Update the screen.
-            pg.display.update()
+            self.flip()
 
     def go_to(self):
         """Stop the main loop and set the global variable next_scene."""
         self.main_loop_running = False
         self.glo.next_scene = self.next_scene
+        self.input.end_scene(self)
 
     def update(self):
-        """Update all sprites and let the camera track the player."""
+        """Update all sprites."""
         self.all_sprites.update()
+
+    def update_view(self, frame_time):
+        """Update what only depends on the rendered frames, like the camera."""
         self.camera.update(self.player)
 
+    def flip(self):
+        """Show the drawn frame in the game window."""
+        pg.display.update()
+
     def fade_draw(self, fade):
         """Draw components."""
-        self.screen.blit(
-            self.map_img, self.camera.apply_rect(self.map_rect))
+        self.map_chunks.draw(self.screen, self.camera)
         for sprite in self.all_sprites:
             self.screen.blit(sprite.image, self.camera.apply(sprite))
         # Draw black surf.
             self.screen.blit(fade, (0, 0))
         # Blit the screen to the display.
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def draw(self):
-        self.screen.blit(
-            self.map_img, self.camera.apply_rect(self.map_rect))
+        self.map_chunks.draw(self.screen, self.camera)
         for sprite in self.all_sprites:
             self.screen.blit(sprite.image, self.camera.apply(sprite))
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def event_loop(self):
         '''the event loop of this scene'''
@@ -90,17 +166,7 @@ class Scene:
     def main_loop(self):
         """the main loop of the scene"""
         while self.main_loop_running:
-            self.dt = self.clock.tick(c.FPS) / 1000
-            # event loop
-            self.event_loop()
-            # Make sure the game won't crash when moving the game window.
-            if self.dt < 0.1:
-                # update items
-                self.update()
-            # draw items
-            self.draw()
-            # update screen
-            pg.display.update()
+            self.run_frame()
             # go to
             if self.next_scene is not None:
                 self.go_to()
@@ -121,17 +187,34 @@ class BattleScene(Scene):
         self.all_sprites = pg .sprite.Group()
         self.walls = pg.sprite.Group()
         self.invisible_walls = pg.sprite.Group()
-        self.particles = pg.sprite.Group()
+        self.particles = ParticleSystem(self)
+        self.combat = CombatResolver()
+        self.physics = PhysicsWorld()
+        self.enemy_manager = EnemyManager(self)
+        self.animator = Animator()
         self.enemies = pg.sprite.Group()
         self.fire_balls = pg.sprite.Group()
         self.tips_text_group = pg.sprite.Group()
         self.exit_text_group = pg.sprite.Group()
-        self.player_info_text_group = pg.sprite.Group()
+        # Knights and fire balls are reused from pools.
+        self.knight_pool = SpritePool(lambda type, x, y, speed, hv: Knight(
+            self, type, x, y, speed, hv, self.size_multiplier))
+        self.knight_pool.prewarm(c.KNIGHTPOOLSIZE, '01', 0, 0, 0, 1)
+        self.fire_ball_pool = SpritePool(lambda x, y, vel: FireBall(
+            self, x, y, vel, self.size_multiplier))
+        self.fire_ball_pool.prewarm(c.FIREBALLPOOLSIZE, 0, 0, (0, 0))
 
     def new_background(self):
         """Add background wallpaper, background images and camera."""
         pass
 
+    def new_collision_grids(self):
+        """Build the wall grids once. The walls never move after new_objs_from_map()."""
+        self.wall_grid = CollisionGrid(self.walls)
+        self.invisible_wall_grid = CollisionGrid(self.invisible_walls)
+        self.physics.set_walls(self.wall_grid, self.invisible_wall_grid)
+        self.particles.set_walls(self.wall_grid)
+
     def new_objs_from_map(self):
         """Traverse the objects in the map and create sprites and rects."""
         pass
@@ -148,88 +231,123 @@ class BattleScene(Scene):
         """Initialize all varis and do all the setup for a new game."""
         # Create groups.
         self.new_groups()
+        # A recorded game is replayed with the random numbers it was played with.
+        seed = self.input.begin_scene(self)
+        if seed is not None:
+            random.seed(seed)
+            self.particles.seed(seed)
         # Create background stuff.
         self.new_background()
         # Load sprites and rects from the map.
         self.new_objs_from_map()
+        # Index the walls.
+        self.new_collision_grids()
         # Create scene text.
         self.new_text()
         # Set sounds and music.
         self.new_music()
+        # Profile the frames if the profiler was on in the last scene.
+        self.profiler = Profiler(self)
+        if self.glo.show_profiler:
+            self.profiler.enable()
+
+    def toggle_profiler(self):
+        """Show or hide the profiler overlay."""
+        self.profiler.toggle()
+        self.glo.show_profiler = self.profiler.enabled
 
     def load_data(self, map_path):
         """Load tile map from files."""
         self.map = TiledMap(map_path)
-        self.map_img = self.map.make_map()
-        self.map_img.set_colorkey((0, 0, 0))
-        # Scale the map.
-        self.map_rect = self.map_img.get_rect()
-        self.map_img = pg.transform.scale(
-            self.map_img, (int(self.size_multiplier * self.map_rect.width), int(self.size_multiplier * self.map_rect.height)))
-        self.map_rect = self.map_img.get_rect()
+        # Split the scaled map into chunks.
+        self.map_chunks = ChunkedMap(
+            self.map, self.size_multiplier, (0, 0, 0))
+        self.map_rect = self.map_chunks.rect
 
     def show_settings_menu(self):
-        """Show settings menu and reset the sound volume."""
+        """Show settings menu. The sounds follow the volume buses, so nothing needs to be reset.
+            The scene clock stands still while the menu is shown."""
         self.confirm_sound.play(maxtime=1000)
         settings_menu = SettingsMenu(
             self.clock, self.screen, self.display, self.glo)
-        next_scene = settings_menu.main()
+        self.scheduler.pause()
+        next_scene = self.input.choose(settings_menu.main)
+        self.scheduler.resume()
         if next_scene is not None:
             # Go back to the main menu.
             self.next_scene = next_scene
-        else:
-            # Set sound volume and return to the scene.
-            for sound in self.sounds:
-                sound.set_volume(c.sound_volume)
-            for sprite in self.enemies:
-                sprite.slash_sound.set_volume(c.sound_volume)
-                sprite.be_hit_sound.set_volume(c.sound_volume)
+
+    def detect_fire_ball_key(self):
+        """Begin or end the press of the fire ball key by the controller."""
+        if self.controller.fire_pressed and not self.player.press_key_l:
+            self.press_key_l()
+        if self.controller.fire_released and self.player.press_key_l:
+            self.release_key_l()
 
     def press_key_l(self):
         """Begin to record the pressed time of key l."""
         self.player.press_key_l = True
-        self.player.press_key_l_begin = pg.time.get_ticks()
+        self.player.press_key_l_begin = self.now
 
     def release_key_l(self):
         """Release key l and get ready to throw a fire ball and get the pressed time."""
         self.player.press_key_l = False
         self.player.throw_fire_ball = True
-        self.player.press_key_l_duration = pg.time.get_ticks() - \
-            self.player.press_key_l_begin
-
-    def fire_ball_hits_enemy(self, sprite):
-        """Detect if there is a fire ball hits the enemy.
-            If there is, the enemy will be slain and particles will be drawn."""
-        for fire_ball in self.fire_balls:
-            if fire_ball.rect.colliderect(sprite.body_rect) and not sprite.invincible:
-                sprite.is_slain()
-                fire_ball.exists = False
-                # Play explosion sound.
-                self.explosion_sound.play()
-                # Create explosion particles.
-                for _ in range(20):
-                    SquareParticle(
-                        self, self.camera, fire_ball.rect.centerx, fire_ball.rect.centery, [c.FIRBALLCOLOR01, c.FIRBALLCOLOR02, c.FIRBALLCOLOR03], [randint(2000, 4000)/10 - 300, randint(0, 8000) / 10 - 600], 20)
+        self.player.press_key_l_duration = self.now - self.player.press_key_l_begin
+
+    def resolve_combat(self):
+        """Resolve the combat events of this frame, then remove the enemies that no longer exist.
+            The events come from the broadphase in the order of the enemies."""
+        for kind, sprite, fire_ball in self.combat.resolve(self.player, self.enemies, self.fire_balls):
+            if kind == FIREBALLHIT:
+                self.fire_ball_hits_enemy(sprite, fire_ball)
+            elif kind == PLAYERSLASH:
+                self.player_slashes_enemy(sprite)
+            # If the enemy has not been slain, the player may be hit.
+            elif not sprite.slain:
+                if kind == BODYCOLLISION:
+                    self.player_collides_enemy(sprite)
+                else:
+                    self.enemy_slashes_player(sprite)
+        for sprite in self.enemies:
+            # if the enemy is slain
+            if sprite.slain:
+                # Draw particles.
+                self.new_enemy_killed_particles(sprite)
+            # Find if the enemy still exists.
+            if not sprite.exists:
+                # If the enemy doesn't exist any longer, remove it from the scene and keep it for reuse.
+                self.knight_pool.release(sprite)
+
+    def fire_ball_hits_enemy(self, sprite, fire_ball):
+        """The fire ball hits the enemy.
+            If the enemy is vincible, it will be slain and particles will be drawn."""
+        if not sprite.invincible:
+            sprite.is_slain()
+            fire_ball.exists = False
+            # Play explosion sound.
+            self.explosion_sound.play()
+            # Create explosion particles.
+            self.particles.emit(fire_ball.rect.centerx, fire_ball.rect.centery, [
+                                c.FIRBALLCOLOR01, c.FIRBALLCOLOR02, c.FIRBALLCOLOR03], 20, (-100, 100), (-600, 200), 20)
 
     def player_slashes_enemy(self, sprite):
-        """Detect if the player slashes the enemy.
-            If it does, set the enemy velocity and minus its hv.
+        """The attack rect of the player overlaps the enemy body rect.
+            If the enemy is vincible, set the enemy velocity and minus its hv.
             If the enemy is slashed to death, the player will get a fire ball."""
-        if self.player.attack_rect is not None:
-            # If player attack rect overlapes with the enemy body rect and the enemy is vincible, begin to slash.
-            if self.player.attack_rect.colliderect(sprite.body_rect) and not sprite.invincible:
-                if self.player.body_rect.centerx < sprite.body_rect.centerx:
-                    sprite.vel[1] = sprite.jump_height / 2
-                elif self.player.body_rect.centerx >= sprite.body_rect.centerx:
-                    sprite.vel[1] = sprite.jump_height / 2
-                sprite.is_hit()
-                # If the player slashes the enemy to his death, the player will get a fire ball.
-                if sprite.hv < 1:
-                    self.player.fire_ball_amount += 1
+        if not sprite.invincible:
+            if self.player.body_rect.centerx < sprite.body_rect.centerx:
+                sprite.vel[1] = sprite.jump_height / 2
+            elif self.player.body_rect.centerx >= sprite.body_rect.centerx:
+                sprite.vel[1] = sprite.jump_height / 2
+            sprite.is_hit()
+            # If the player slashes the enemy to his death, the player will get a fire ball.
+            if sprite.hv < 1:
+                self.player.fire_ball_amount += 1
 
     def player_collides_enemy(self, sprite):
-        """Detect if player collides with the enemy."""
-        if self.player.body_rect.colliderect(sprite.body_rect) and not self.player.invincible:
+        """The player collides with the enemy."""
+        if not self.player.invincible:
             if self.player.body_rect.x + self.player.body_rect.width > sprite.body_rect.x and self.player.body_rect.centerx < sprite.body_rect.centerx:
                 self.player.vel[0] = -2 * self.player.player_speed
                 self.player.vel[1] = self.player.jump_height / 2
@@ -239,9 +357,9 @@ class BattleScene(Scene):
             self.player.is_hit()
 
     def enemy_slashes_player(self, sprite):
-        """Detect if the enemy slashes the player.
-            If it does, set the player velocity and minus his hv."""
-        if sprite.attack_rect is not None and self.player.body_rect.colliderect(sprite.attack_rect) and not self.player.invincible:
+        """The attack rect of the enemy overlaps the player.
+            If the player is vincible, set the player velocity and minus his hv."""
+        if not self.player.invincible:
             if sprite.attack_dir == 'attack_left':
                 self.player.vel[0] = -3 * self.player.player_speed
                 self.player.vel[1] = self.player.jump_height / 2
@@ -251,7 +369,12 @@ class BattleScene(Scene):
             self.player.is_hit()
 
     def new_enemy_killed_particles(self, sprite):
-        """Create 1 particle when the enemy is killed."""
+        """Create 1 particle every 1/60 sec while the enemy is slain."""
+        sprite.particle_credit += self.sim.dt * 60
+        amount = int(sprite.particle_credit)
+        if amount == 0:
+            return
+        sprite.particle_credit -= amount
         particle_color = []  # The color depends on the type of the enemy.
         if sprite.type == '01':
             particle_color = [
@@ -262,9 +385,8 @@ class BattleScene(Scene):
         elif sprite.type == '03':
             particle_color = [
                 c.KNIGHTCOLOR0301, c.KNIGHTCOLOR0302, c.KNIGHTCOLOR0303, c.KNIGHTCOLOR0304]
-        for _ in range(1):
-            SquareParticle(
-                self, self.camera, sprite.body_rect.centerx, sprite.body_rect.centery, particle_color, [randint(2000, 4000)/10 - 300, randint(1000, 5000)/10 - 400], 30)
+        self.particles.emit(sprite.body_rect.centerx, sprite.body_rect.centery,
+                            particle_color, amount, (-100, 100), (-300, 100), 30)
 
     def show_tips(self):
         """Detect if to show tips."""
@@ -290,7 +412,7 @@ class BattleScene(Scene):
         """Show selection box and update the archive. Unlock the next level."""
         sb = SelectionBox(self.clock, self.screen, self.display, 'Enemies: '+str(self.total_enemy_amount -
                                                                                  len(self.enemies))+'/'+str(self.total_enemy_amount), c.BACKTO1982, 20, self.glo, ('restart', 15), ('exit', 15))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['cliff', 'player01']
@@ -298,14 +420,14 @@ class BattleScene(Scene):
     def show_fail_selection_box(self):
         sb = SelectionBox(self.clock, self.screen, self.display, 'failed',
                           c.BACKTO1982, 20, self.glo, ('restart', 15), ('exit', 15))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['cliff', 'player01']
 
     def event_loop(self):
         """the event loop of the game"""
-        for event in pg.event.get():
+        for event in self.input.events():
             if event.type == pg.QUIT:
                 pg.quit()
                 sys.exit()
@@ -313,44 +435,23 @@ class BattleScene(Scene):
                 # Display the settings menu.
                 if event.key == pg.K_ESCAPE:
                     self.show_settings_menu()
-                # Detect the length of pressed key l.
-                if event.key == pg.K_l and not self.player.press_key_l:
-                    self.press_key_l()
+                # Show or hide the profiler overlay.
+                if event.key == pg.K_F3:
+                    self.toggle_profiler()
                 # Detect if to exit the scene.
                 if event.key == pg.K_e and self.activate_exit_text:
                     self.show_exit_selection_box()
-            elif event.type == pg.KEYUP:
-                if event.key == pg.K_l and self.player.press_key_l:
-                    self.release_key_l()
+        # Detect the length of the press of the fire ball key.
+        self.detect_fire_ball_key()
         # Detect the event of the enemies.
-        for sprite in self.enemies:
-            # Detect if the fire ball attacks the enemy.
-            self.fire_ball_hits_enemy(sprite)
-            # Detect if the player slashes the enemy.
-            self.player_slashes_enemy(sprite)
-            # If the enemy has not been slain, the player may be hit.
-            if not sprite.slain:
-                # Detect if the player collides the body of the enemy.
-                self.player_collides_enemy(sprite)
-                # Detect if the enemy slashes the player.
-                self.enemy_slashes_player(sprite)
-            # if the enemy is slain
-            else:
-                # Draw particles.
-                self.new_enemy_killed_particles(sprite)
-            # Find if the enemy still exists.
-            if not sprite.exists:
-                # If the enemy doesn't exist any longer, remove it from all the groups it belongs
-                self.all_sprites.remove(sprite)
-                self.enemies.remove(sprite)
+        self.resolve_combat()
         # Detect if the player still exists.
         if self.player.hv < 1:
             self.show_fail_selection_box()
         # Detect if the fire ball still exists.
         for fire_ball in self.fire_balls:
             if not fire_ball.exists:
-                self.fire_balls.remove(fire_ball)
-                self.all_sprites.remove(fire_ball)
+                self.fire_ball_pool.release(fire_ball)
         # Detect whether to show tips or not.
         self.show_tips()
         # Detect whether to show exit text or not.
@@ -363,12 +464,10 @@ class BattleScene(Scene):
         # Draw background images.
         for bg in self.backgrounds:
             bg.draw()
-        # Draw map.
-        self.screen.blit(self.map_img, self.camera.apply_rect(self.map_rect))
+        # Draw the map chunks in sight.
+        self.map_chunks.draw(self.screen, self.camera)
         # Draw sprites.
-        for sprite in self.all_sprites:
-            # Blit the sprite image.
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
+        self.draw_sprites()
         # Draw tips.
         if self.activate_tips_text:
             for text in self.tips_text_group:
@@ -380,21 +479,26 @@ class BattleScene(Scene):
                 self.screen.blit(
                     text.text_surf, self.camera.apply_rect(text.text_rect))
         # Draw particles
-        for sprite in self.particles:
-            sprite.draw()
-        # Draw player info text.
-        for text in self.player_info_text_group:
-            text.draw()
+        self.particles.draw(self.screen, self.camera, self.sim.alpha)
+        # Draw player info.
+        self.hud.draw()
         # Avoid screen flickering.
         if self.next_scene is not None and self.next_scene[0] == 'scene_selection_menu':
             # Draw screen black.
             pg.draw.rect(self.screen, c.BLACK, self.screen.get_rect())
-        print(self.clock.get_fps())
+
+    def draw_sprites(self):
+        """Draw sprites between their last two positions."""
+        lag = self.physics.lag(self.sim.alpha)
+        x, y = self.camera.x, self.camera.y
+        for sprite in self.all_sprites:
+            dx, dy = lag[sprite.body]
+            # Blit the sprite image.
+            self.screen.blit(sprite.image, sprite.rect.move(x + dx, y + dy))
 
     def scale_screen(self):
         """Scale the scene surface to the game window size."""
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.glo.present(self.screen)
 
     def draw(self):
         """Draw everything in the scene."""
@@ -411,11 +515,7 @@ class BattleScene(Scene):
 
     def update_particles(self):
         """Update particles in the scene."""
-        if len(self.particles) != 0:
-            for sprite in self.particles:
-                sprite.update()
-                if sprite.timer < 0:
-                    self.particles.remove(sprite)
+        self.particles.update()
 
     def update_tips(self):
         """Update the tips text in the scene."""
@@ -429,29 +529,48 @@ class BattleScene(Scene):
             for text in self.exit_text_group:
                 text.update()
 
+    def new_hud(self, color):
+        """Create the player info. The HUD only renders a field again when its value changes."""
+        self.hud = Hud(self.screen, c.BACKTO1982, 15,
+                       color, (30, -30), (30, 30))
+        self.hud.add_field('Hv: ', lambda: self.player.hv, 0)
+        self.hud.add_field(
+            'FireBall: ', lambda: self.player.fire_ball_amount, 90)
+        self.hud.add_field('Enemies: ', self.get_enemy_info, 250)  # enemies killed
+
+    def get_enemy_info(self):
+        """Return the amount of enemies killed and the total enemy amount."""
+        return self.total_enemy_amount - len(self.enemies), self.total_enemy_amount
+
     def update_player_info(self):
         """Update the player info in the scene."""
-        self.player_info_text_group.sprites()[0].update(
-            'Hv: '+str(self.player.hv))
-        self.player_info_text_group.sprites()[1].update(
-            'FireBall: '+str(self.player.fire_ball_amount))
-        self.player_info_text_group.sprites()[2].update(
-            'Enemies: '+str(self.total_enemy_amount -
-                            len(self.enemies))+'/'+str(self.total_enemy_amount))
+        self.hud.update()
 
     def update(self):
         """Update all sprites and let the camera track the player."""
+        # Step the animations of all sprites.
+        self.animator.update(self.now)
         self.all_sprites.update()
+        # Update the AI of all knights.
+        self.enemy_manager.update(self.player)
+        # Move all bodies.
+        self.physics.step(self.sim.dt)
+        self.enemy_manager.read_contacts()
         # Update particles.
         self.update_particles()
+
+    def update_view(self, frame_time):
+        """Update the texts and the camera once a frame."""
         # Update tips text.
         self.update_tips()
         # Update exit text.
         self.update_exit_text()
         # Update player information.
         self.update_player_info()
-        # Update camera by the player.
-        self.camera.delayed_update(self.player)
+        # Update camera by where the player is drawn.
+        dx, dy = self.physics.lag(self.sim.alpha)[self.player.body]
+        self.camera.delayed_update(
+            self.player.rect.move(dx, dy), frame_time)
 
     def fade_draw(self, fade):
         """Draw components."""
@@ -468,8 +587,8 @@ class Cliff(BattleScene):
 
     def new_background(self):
         # Create screen wallpaper.
-        self.screen_background = pg.transform.scale(
-            pg.image.load(c.CLIFFBACKGROUND), (SCREENWIDTH, SCREENHEIGHT))
+        self.screen_background = assets.image(
+            c.CLIFFBACKGROUND, (SCREENWIDTH, SCREENHEIGHT))
         # Create and add backgrouds
         self.backgrounds = []
         # Create the camera.
@@ -496,14 +615,14 @@ class Cliff(BattleScene):
                         self, tile_object.x * self.size_multiplier, tile_object.y * self.size_multiplier, 250, 5, 5, self.size_multiplier)
             elif tile_object.type == 'knight':
                 if tile_object.name == 'knight01':
-                    Knight(self, '01', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(60, 80), 1, self.size_multiplier)
+                    self.knight_pool.acquire('01', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(60, 80), 1)
                 elif tile_object.name == 'knight02':
-                    Knight(self, '02', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(80, 100), 2, self.size_multiplier)
+                    self.knight_pool.acquire('02', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(80, 100), 2)
                 elif tile_object.name == 'knight03':
-                    Knight(self, '03', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(100, 120), 3, self.size_multiplier)
+                    self.knight_pool.acquire('03', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(100, 120), 3)
             if tile_object.name == 'obstacle':
                 Obstacle(self, tile_object.x * self.size_multiplier, tile_object.y * self.size_multiplier,
                          tile_object.width * self.size_multiplier, tile_object.height * self.size_multiplier)
@@ -521,52 +640,38 @@ class Cliff(BattleScene):
 
     def new_text(self):
         # tips text
-        Text(self, self.map_img, 'Tips:', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, 'Tips:', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 3 / 5), self.tips_text_group)
-        Text(self, self.map_img, '  J: slash', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, '  J: slash', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 25 / 40), self.tips_text_group)
-        Text(self, self.map_img, '  L: throw a fire ball', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, '  L: throw a fire ball', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 26 / 40), self.tips_text_group)
-        Text(self, self.map_img, '    Hold L longer to throw farther!', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, '    Hold L longer to throw farther!', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 27 / 40), self.tips_text_group)
-        Text(self, self.map_img, '    Slash enemies to get fire balls!', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, '    Slash enemies to get fire balls!', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 28 / 40), self.tips_text_group)
-        Text(self, self.map_img, '  Don\'t bump into the enemies!', c.TICKETING, 20, c.DARKPURPLE, (-30,
+        Text(self, self.screen, '  Don\'t bump into the enemies!', c.TICKETING, 20, c.DARKPURPLE, (-30,
              self.map_rect.height * 3 / 5), (170, self.map_rect.height * 29 / 40), self.tips_text_group)
         # exit text
-        Text(self, self.map_img, 'Press E to exit.', c.TICKETING, 20, c.WHITE, (self.map_rect.width + 30,
+        Text(self, self.screen, 'Press E to exit.', c.TICKETING, 20, c.WHITE, (self.map_rect.width + 30,
              self.map_rect.height * 3 / 5), (self.map_rect.width - 150, self.map_rect.height * 3 / 5), self.exit_text_group)
-        # player info text
-        Text(self, self.screen, 'Hv:'+str(self.player.hv), c.BACKTO1982, 15,
-             c.DARKPURPLE, (30, -30), (30, 30), self.player_info_text_group)
-        Text(self, self.screen, 'FireBall:'+str(self.player.fire_ball_amount), c.BACKTO1982, 15,
-             c.DARKPURPLE, (120, -30), (120, 30), self.player_info_text_group)
-        Text(self, self.screen, 'Enemies: 0/'+str(self.total_enemy_amount), c.BACKTO1982, 15,
-             c.DARKPURPLE, (280, -30), (280, 30), self.player_info_text_group)  # enemies killed
+        # player info
+        self.new_hud(c.DARKPURPLE)
 
     def new_music(self):
-        self.sounds = []
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
-        self.explosion_sound = pg.mixer.Sound(c.EXPLOSIONSOUND)
-        self.explosion_sound.set_volume(c.sound_volume * 8)
-        # Append all sounds to the list.
-        self.sounds.append(self.confirm_sound)
-        self.sounds.append(self.explosion_sound)
-        self.sounds.append(self.player.slash_sound)
-        self.sounds.append(self.player.throw_fire_ball_sound)
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
+        self.explosion_sound = sounds.sound(c.EXPLOSIONSOUND, gain=8)
 
         # Set up bgm.
-        pg.mixer.music.load(c.CLIFFBGM)
-        pg.mixer.music.set_volume(c.bgm_volume)
+        sounds.load_music(c.CLIFFBGM)
         # Play bgm.
-        pg.mixer.music.play(loops=-1, fade_ms=2000)
+        sounds.play_music(fade_ms=2000)
 
     def show_exit_selection_box(self):
         """Show selection box and update the archive. Unlock the next level."""
         sb = SelectionBox(self.clock, self.screen, self.display, 'Enemies: '+str(self.total_enemy_amount -
                                                                                  len(self.enemies))+'/'+str(self.total_enemy_amount), c.BACKTO1982, 20, self.glo, ('restart', 20), ('exit', 20))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['cliff', 'player01']
@@ -575,7 +680,7 @@ class Cliff(BattleScene):
     def show_fail_selection_box(self):
         sb = SelectionBox(self.clock, self.screen, self.display, 'failed',
                           c.BACKTO1982, 20, self.glo, ('restart', 20), ('exit', 20))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['cliff', 'player01']
@@ -587,23 +692,14 @@ class Cliff(BattleScene):
         self.fade_in()
         self.main_loop()
 
-    def update_player_info(self):
-        self.player_info_text_group.sprites()[0].update(
-            'Hv: '+str(self.player.hv))
-        self.player_info_text_group.sprites()[1].update(
-            'FireBall: '+str(self.player.fire_ball_amount))
-        self.player_info_text_group.sprites()[2].update(
-            'Enemies: '+str(self.total_enemy_amount -
-                            len(self.enemies))+'/'+str(self.total_enemy_amount))
-
 
 class StringStar(BattleScene):
     def __init__(self, clock, screen, display, glo, size_multiplier) -> None:
         super().__init__(clock, screen, display, glo, size_multiplier)
 
     def new_background(self):
-        self.screen_background = pg.transform.scale(
-            pg.image.load(c.STRINGSTARBACKGROUND), (SCREENWIDTH, SCREENHEIGHT))
+        self.screen_background = assets.image(
+            c.STRINGSTARBACKGROUND, (SCREENWIDTH, SCREENHEIGHT))
         # Create and add backgrouds
         self.backgrounds = []
         # Create the camera.
@@ -631,14 +727,14 @@ class StringStar(BattleScene):
                         self, tile_object.x * self.size_multiplier, tile_object.y * self.size_multiplier, 250, 5, 5, self.size_multiplier)
             elif tile_object.type == 'knight':
                 if tile_object.name == 'knight01':
-                    Knight(self, '01', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(60, 80), 1, self.size_multiplier)
+                    self.knight_pool.acquire('01', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(60, 80), 1)
                 elif tile_object.name == 'knight02':
-                    Knight(self, '02', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(80, 100), 2, self.size_multiplier)
+                    self.knight_pool.acquire('02', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(80, 100), 2)
                 elif tile_object.name == 'knight03':
-                    Knight(self, '03', tile_object.x * self.size_multiplier,
-                           tile_object.y * self.size_multiplier, randint(100, 120), 3, self.size_multiplier)
+                    self.knight_pool.acquire('03', tile_object.x * self.size_multiplier,
+                                             tile_object.y * self.size_multiplier, randint(100, 120), 3)
             if tile_object.name == 'obstacle':
                 Obstacle(self, tile_object.x * self.size_multiplier, tile_object.y * self.size_multiplier,
                          tile_object.width * self.size_multiplier, tile_object.height * self.size_multiplier)
@@ -656,43 +752,29 @@ class StringStar(BattleScene):
 
     def new_text(self):
         # tips text
-        Text(self, self.map_img, 'Enemies could be stronger.', c.TICKETING, 20, c.WHITE, (-30,
+        Text(self, self.screen, 'Enemies could be stronger.', c.TICKETING, 20, c.WHITE, (-30,
              self.map_rect.height * 3 / 5), (20, self.map_rect.height * 22 / 40), self.tips_text_group)
-        Text(self, self.map_img, 'BE CAREFUL!', c.TICKETING, 20, c.WHITE, (-30,
+        Text(self, self.screen, 'BE CAREFUL!', c.TICKETING, 20, c.WHITE, (-30,
              self.map_rect.height * 3 / 5), (20, self.map_rect.height * 23 / 40), self.tips_text_group)
         # exit text
-        Text(self, self.map_img, 'Press E to exit.', c.TICKETING, 20, c.WHITE, (self.map_rect.width + 30,
+        Text(self, self.screen, 'Press E to exit.', c.TICKETING, 20, c.WHITE, (self.map_rect.width + 30,
              self.map_rect.height * 3 / 5), (self.map_rect.width - 150, self.map_rect.height * 23 / 40), self.exit_text_group)
-        # player info text
-        Text(self, self.screen, 'Hv:'+str(self.player.hv), c.BACKTO1982, 15,
-             c.WHITE, (30, -30), (30, 30), self.player_info_text_group)
-        Text(self, self.screen, 'FireBall:'+str(self.player.fire_ball_amount), c.BACKTO1982, 15,
-             c.WHITE, (120, -30), (120, 30), self.player_info_text_group)
-        Text(self, self.screen, 'Enemies: 0/'+str(self.total_enemy_amount), c.BACKTO1982, 15,
-             c.WHITE, (280, -30), (280, 30), self.player_info_text_group)  # enemies killed
+        # player info
+        self.new_hud(c.WHITE)
 
     def new_music(self):
-        self.sounds = []
         # Set sounds and music.
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
-        self.explosion_sound = pg.mixer.Sound(c.EXPLOSIONSOUND)
-        self.explosion_sound.set_volume(c.sound_volume * 8)
-        # Append all sounds to the list.
-        self.sounds.append(self.confirm_sound)
-        self.sounds.append(self.explosion_sound)
-        self.sounds.append(self.player.slash_sound)
-        self.sounds.append(self.player.throw_fire_ball_sound)
-        pg.mixer.music.load(c.STRINGSTARBGM)
-        pg.mixer.music.set_volume(c.bgm_volume)
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
+        self.explosion_sound = sounds.sound(c.EXPLOSIONSOUND, gain=8)
+        sounds.load_music(c.STRINGSTARBGM)
         # Play bgm.
-        pg.mixer.music.play(loops=-1, fade_ms=2000)
+        sounds.play_music(fade_ms=2000)
 
     def show_exit_selection_box(self):
         """Show selection box and update the archive. Unlock the next level."""
         sb = SelectionBox(self.clock, self.screen, self.display, 'Enemies: '+str(self.total_enemy_amount -
                                                                                  len(self.enemies))+'/'+str(self.total_enemy_amount), c.BACKTO1982, 20, self.glo, ('restart', 20), ('exit', 20))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['string_star', 'player01']
@@ -701,7 +783,7 @@ class StringStar(BattleScene):
     def show_fail_selection_box(self):
         sb = SelectionBox(self.clock, self.screen, self.display, 'failed',
                           c.BACKTO1982, 20, self.glo, ('restart', 20), ('exit', 20))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
             self.next_scene = ['string_star', 'player01']
@@ -713,24 +795,18 @@ class StringStar(BattleScene):
         self.fade_in()
         self.main_loop()
 
-    def update_player_info(self):
-        # Update player info
-        self.player_info_text_group.sprites()[0].update(
-            'Hv: '+str(self.player.hv))
-        self.player_info_text_group.sprites()[1].update(
-            'FireBall: '+str(self.player.fire_ball_amount))
-        self.player_info_text_group.sprites()[2].update(
-            'Enemies: '+str(self.total_enemy_amount -
-                            len(self.enemies))+'/'+str(self.total_enemy_amount))
-
 
 class InfiniteModeCliff(BattleScene):
+    restart_scene = 'infinite_mode_cliff'  # the scene played again by 'restart'
+
     def __init__(self, clock, screen, display, glo, size_multiplier) -> None:
         super().__init__(clock, screen, display, glo, size_multiplier)
         self.set_up_booleans()  # Set up booleans.
         self.set_up_timers()
         self.set_up_enemy_generation_counter()
         self.game_round = 0  # game round
+        # The enemy info is only updated when enemies are not being generated.
+        self.enemy_info = (0, 0)
 
     def set_up_booleans(self):
         """Set up booleans in the scene."""
@@ -741,24 +817,19 @@ class InfiniteModeCliff(BattleScene):
 
     def set_up_timers(self):
         """Set up round text timer and enemy generation timer."""
-        self.round_text_last_update = 0
         self.round_text_interval = 2000  # the time interval of the round text.
         self.generate_enemies_interval = 500
-        self.generate_enemies_last_update = 0
+        self.spawn_timer = None
 
     def set_up_enemy_generation_counter(self):
         """Set up the attributes about enemy generation."""
         self.generation_amount = 0
         self.enemy_generation_counter = 0
 
-    def new_groups(self):
-        super().new_groups()
-        self.round_text_group = pg.sprite.Group()
-
     def new_background(self):
         # Create screen background.
-        self.screen_background = pg.transform.scale(
-            pg.image.load(c.CLIFFBACKGROUND), (SCREENWIDTH, SCREENHEIGHT))
+        self.screen_background = assets.image(
+            c.CLIFFBACKGROUND, (SCREENWIDTH, SCREENHEIGHT))
         # Create and add backgrouds
         self.backgrounds = []
         # Create the camera.
@@ -801,60 +872,52 @@ class InfiniteModeCliff(BattleScene):
 
     def new_text(self):
         # tips text
-        Text(self, self.map_img, 'Infinite mode.', c.TICKETING, 20, c.WHITE, (-30,
+        Text(self, self.screen, 'Infinite mode.', c.TICKETING, 20, c.WHITE, (-30,
              self.map_rect.height / 2), (20, self.map_rect.height * 16 / 40), self.tips_text_group)
-        Text(self, self.map_img, 'You will be healed every 5 rounds.', c.TICKETING, 20, c.WHITE, (-30,
+        Text(self, self.screen, 'You will be healed every 5 rounds.', c.TICKETING, 20, c.WHITE, (-30,
              self.map_rect.height / 2), (20, self.map_rect.height * 17 / 40), self.tips_text_group)
-        Text(self, self.map_img, 'Try to survive!', c.TICKETING, 20, c.WHITE, (-30,
+        Text(self, self.screen, 'Try to survive!', c.TICKETING, 20, c.WHITE, (-30,
              self.map_rect.height / 2), (20, self.map_rect.height * 18 / 40), self.tips_text_group)
-        # player info text
-        Text(self, self.screen, 'Hv:'+str(self.player.hv), c.BACKTO1982, 15,
-             c.AQUA, (30, -30), (30, 30), self.player_info_text_group)
-        Text(self, self.screen, 'FireBall:'+str(self.player.fire_ball_amount), c.BACKTO1982, 15,
-             c.AQUA, (120, -30), (120, 30), self.player_info_text_group)
-        Text(self, self.screen, 'Enemies: 0/0', c.BACKTO1982, 15,
-             c.AQUA, (280, -30), (280, 30), self.player_info_text_group)  # enemies killed
+        # player info
+        self.new_hud(c.AQUA)
         # round text
-        self.round_text = Text(self, self.screen, 'ROUND:'+str(self.game_round), c.TICKETING, 40,
-                               c.AQUA, (220, -30), (220, 170), self.round_text_group)
+        self.round_text = Hud(self.screen, c.TICKETING, 40,
+                              c.AQUA, (220, -30), (220, 170))
+        self.round_text.add_field('ROUND: ', lambda: self.game_round, 0)
 
     def new_music(self):
-        self.sounds = []
         # Set sounds and music.
-        self.confirm_sound = pg.mixer.Sound(c.CONFIRMSOUND)
-        self.confirm_sound.set_volume(c.sound_volume)
-        self.explosion_sound = pg.mixer.Sound(c.EXPLOSIONSOUND)
-        self.explosion_sound.set_volume(c.sound_volume * 8)
-        self.heal_sound = pg.mixer.Sound(c.HEALSOUND)
-        self.heal_sound.set_volume(c.sound_volume)
-        # Append all sounds to the list.
-        self.sounds.append(self.confirm_sound)
-        self.sounds.append(self.explosion_sound)
-        self.sounds.append(self.player.slash_sound)
-        self.sounds.append(self.player.throw_fire_ball_sound)
-        self.sounds.append(self.heal_sound)
-        pg.mixer.music.load(c.INFINITEMODEBGM)
-        pg.mixer.music.set_volume(c.bgm_volume)
+        self.confirm_sound = sounds.sound(c.CONFIRMSOUND, 'ui')
+        self.explosion_sound = sounds.sound(c.EXPLOSIONSOUND, gain=8)
+        self.heal_sound = sounds.sound(c.HEALSOUND)
+        sounds.load_music(c.INFINITEMODEBGM)
 
     def begin_game(self):
         """Begin the game, start the game round and play the bgm."""
         if self.player.rect.colliderect(self.enter_rects['game_begin']) and not self.game_begin:
             self.game_begin = True  # Begin game.
             # Play bgm.
-            pg.mixer.music.play(loops=-1, fade_ms=2000)
+            sounds.play_music(fade_ms=2000)
             self.game_round += 1  # Begin round 1.
-            # Update round text.
-            self.round_text.update('ROUND: '+str(self.game_round))
-            self.show_round_text = True  # Show round text.
-            self.round_text_last_update = pg.time.get_ticks()
+            self.show_round()
 
     def begin_next_round(self):
         """Plus the game ground and get ready to show the game round text."""
         if self.game_begin and not (self.show_round_text or self.generate_enemies) and len(self.enemies) == 0:
             self.game_round += 1
-            self.round_text.update('ROUND: '+str(self.game_round))
-            self.show_round_text = True
-            self.round_text_last_update = pg.time.get_ticks()
+            self.show_round()
+
+    def show_round(self):
+        """Show the round text. The enemies are generated when it disappears."""
+        self.round_text.update()
+        self.show_round_text = True
+        self.scheduler.after(self.round_text_interval, self.hide_round)
+
+    def hide_round(self):
+        self.show_round_text = False
+        # Put the round text to initial position.
+        self.round_text.update_init_pos((300, -30))
+        self.start_wave()
 
     def heal_player(self):
         """Heal player every 5 rounds."""
@@ -872,14 +935,14 @@ class InfiniteModeCliff(BattleScene):
         """Show selection box and information."""
         sb = SelectionBox(self.clock, self.screen, self.display, 'You reached: '+str(
             self.game_round), c.BACKTO1982, 20, self.glo, ('restart', 15), ('exit', 15))
-        if sb.main():
+        if self.input.choose(sb.main):
             self.next_scene = ['scene_selection_menu', None]
         else:
-            self.next_scene = ['infinite_mode_cliff', 'player01']
+            self.next_scene = [self.restart_scene, 'player01']
 
     def event_loop(self):
         """the event loop of the game"""
-        for event in pg.event.get():
+        for event in self.input.events():
             if event.type == pg.QUIT:
                 pg.quit()
                 sys.exit()
@@ -887,39 +950,17 @@ class InfiniteModeCliff(BattleScene):
                 # Display the settings menu.
                 if event.key == pg.K_ESCAPE:
                     self.show_settings_menu()
-                # Detect the length of pressed key l.
-                if event.key == pg.K_l and not self.player.press_key_l:
-                    self.press_key_l()
-
-            elif event.type == pg.KEYUP:
-                if event.key == pg.K_l and self.player.press_key_l:
-                    self.release_key_l()
+                # Show or hide the profiler overlay.
+                if event.key == pg.K_F3:
+                    self.toggle_profiler()
+        # Detect the length of the press of the fire ball key.
+        self.detect_fire_ball_key()
         # Detect the event of the enemies.
-        for sprite in self.enemies:
-            # Fire ball attacks the enemy.
-            self.fire_ball_hits_enemy(sprite)
-            # Player attacks the enemy.
-            self.player_slashes_enemy(sprite)
-
-            # If the enemy has not been slain, the player may be hit.
-            if not sprite.slain:
-                # If player collides the body of the enemy, player would be hit.
-                self.player_collides_enemy(sprite)
-                # The enemy attacks the player.
-                self.enemy_slashes_player(sprite)
-            # if the enemy is slain
-            else:
-                self.new_enemy_killed_particles(sprite)
-            # Find if the enemy still exists.
-            if not sprite.exists:
-                # If the enemy doesn't exist any longer, remove it from all the groups it belongs
-                self.all_sprites.remove(sprite)
-                self.enemies.remove(sprite)
+        self.resolve_combat()
         # Detect if the fire ball still exists.
         for fire_ball in self.fire_balls:
             if not fire_ball.exists:
-                self.fire_balls.remove(fire_ball)
-                self.all_sprites.remove(fire_ball)
+                self.fire_ball_pool.release(fire_ball)
         # Detect if the player still exists.
         if self.player.hv < 1:
             self.show_exit_selection_box()
@@ -931,57 +972,64 @@ class InfiniteModeCliff(BattleScene):
         self.begin_next_round()
         # Heal player every 5 rounds.
         self.heal_player()
-        # Detect if to create enemies.
-        self.new_enemies()
-
-    def new_enemies(self):
-        """If it's the time to generate enemies, new enemies by the game round."""
-        if self.generate_enemies:
-            # Determine enemy generation amount.
-            if 0 < self.game_round <= 3:
-                self.generation_amount = 3
-            elif 4 <= self.game_round <= 10:
-                self.generation_amount = self.game_round
-            else:
-                self.generation_amount = 10
-            # Choose the enemy position.(random)
-            knight_pos = self.knights_pos[randint(
-                0, len(self.knights_pos) - 1)]
-            # Generate an enemy half a sec.
-            if pg.time.get_ticks() - self.generate_enemies_last_update > self.generate_enemies_interval:
-                # Generate different kinds of enemy by the game round.
-                if 0 < self.game_round <= 2:
-                    Knight(self, '01', knight_pos[0],
-                           knight_pos[1], randint(30, 40), 1, self.size_multiplier)
-                elif 3 <= self.game_round <= 6:
-                    Knight(self, '02', knight_pos[0],
-                           knight_pos[1], randint(40, 60), 2, self.size_multiplier)
-                elif self.game_round >= 7:
-                    Knight(self, '03', knight_pos[0],
-                           knight_pos[1], randint(60, 80), 3, self.size_multiplier)
-                # Update the enemy generation counter.
-                self.enemy_generation_counter += 1
-                self.generate_enemies_last_update = pg.time.get_ticks()
-            # If the counter reaches the amount, stop generating enemies.
-            if self.enemy_generation_counter == self.generation_amount:
-                self.generate_enemies = False
-                # Reset the counter.
-                self.enemy_generation_counter = 0
+
+    def get_wave_size(self):
+        """Get the enemy generation amount of the game round."""
+        if 0 < self.game_round <= 3:
+            return 3
+        elif 4 <= self.game_round <= 10:
+            return self.game_round
+        else:
+            return 10
+
+    def start_wave(self):
+        """Start generating the enemies of the round, one every generation interval."""
+        self.generate_enemies = True
+        self.generation_amount = self.get_wave_size()
+        self.enemy_generation_counter = 0
+        self.spawn_timer = self.scheduler.every(
+            self.generate_enemies_interval, self.spawn_enemies, delay=0)
+
+    def spawn_enemies(self):
+        """Generate an enemy by the game round."""
+        # Choose the enemy position.(random)
+        knight_pos = self.knights_pos[randint(
+            0, len(self.knights_pos) - 1)]
+        # Generate different kinds of enemy by the game round.
+        if 0 < self.game_round <= 2:
+            self.knight_pool.acquire('01', knight_pos[0],
+                                     knight_pos[1], randint(30, 40), 1)
+        elif 3 <= self.game_round <= 6:
+            self.knight_pool.acquire('02', knight_pos[0],
+                                     knight_pos[1], randint(40, 60), 2)
+        elif self.game_round >= 7:
+            self.knight_pool.acquire('03', knight_pos[0],
+                                     knight_pos[1], randint(60, 80), 3)
+        # Update the enemy generation counter.
+        self.enemy_generation_counter += 1
+        self.detect_wave_complete()
+
+    def detect_wave_complete(self):
+        """If the counter reaches the amount, stop generating enemies."""
+        if self.enemy_generation_counter >= self.generation_amount:
+            self.generate_enemies = False
+            self.spawn_timer.cancel()
+            # Reset the counter.
+            self.enemy_generation_counter = 0
+
+    def get_enemy_info(self):
+        """Return the amount of enemies killed and the enemy amount of this round."""
+        if self.game_begin and not self.generate_enemies:
+            self.enemy_info = (self.generation_amount -
+                               len(self.enemies), self.generation_amount)
+        return self.enemy_info
 
     def draw_round_text(self):
         """If it's the time to show round text, Update and draw the round text.
             Otherwise do nothing."""
-        # If it's the time to show round text.
         if self.show_round_text:
-            if pg.time.get_ticks() - self.round_text_last_update < self.round_text_interval:
-                self.round_text.update()
-                self.round_text.draw()
-            else:
-                self.show_round_text = False
-                # Put the round text to initial position.
-                self.round_text.update_init_pos((300, -30))
-                # Generate enemies.
-                self.generate_enemies = True
+            self.round_text.update()
+            self.round_text.draw()
 
     def draw(self):
         """Draw components."""
@@ -989,8 +1037,7 @@ class InfiniteModeCliff(BattleScene):
         # Draw round text.
         self.draw_round_text()
         # Scale the scene surf to the game window size.
-        self.display.blit(pg.transform.scale(
-            self.screen, (self.glo.display_width, self.glo.display_height)), (0, 0))
+        self.scale_screen()
 
     def main(self):
         """The main skeleton of the game process."""
@@ -999,13 +1046,85 @@ class InfiniteModeCliff(BattleScene):
         self.fade_in()
         self.main_loop()
 
-    def update_player_info(self):
-        # Update player info
-        self.player_info_text_group.sprites()[0].update(
-            'Hv: '+str(self.player.hv))
-        self.player_info_text_group.sprites()[1].update(
-            'FireBall: '+str(self.player.fire_ball_amount))
-        if self.game_begin and not self.generate_enemies:
-            self.player_info_text_group.sprites()[2].update(
-                'Enemies: '+str(self.generation_amount -
-                                len(self.enemies))+'/'+str(self.generation_amount))
+
+class HordeModeCliff(InfiniteModeCliff):
+    """A stress variant of the infinite mode. Every wave spawns wave_size + wave_growth * (round - 1)
+       knights(at most max_wave_size), fan_out of them every spawn_interval ms, each at a
+       different spawn point. The frame time of every wave is recorded and saved to stats_path
+       when the wave is cleared. If immortal, the player is healed instead of dying."""
+    restart_scene = 'horde_mode_cliff'
+
+    def __init__(self, clock, screen, display, glo, size_multiplier, wave_size=c.HORDEWAVESIZE,
+                 wave_growth=c.HORDEWAVEGROWTH, max_wave_size=c.HORDEMAXWAVESIZE,
+                 spawn_interval=c.HORDESPAWNINTERVAL, fan_out=c.HORDEFANOUT,
+                 stats_path=c.HORDESTATSPATH, immortal=False) -> None:
+        super().__init__(clock, screen, display, glo, size_multiplier)
+        self.wave_size = wave_size
+        self.wave_growth = wave_growth
+        self.max_wave_size = max_wave_size
+        self.generate_enemies_interval = spawn_interval
+        self.fan_out = fan_out
+        self.stats_path = stats_path
+        self.immortal = immortal
+        self.wave_stats = WaveStats()
+        self.frame_begin = 0
+
+    def options(self):
+        # The statistics are where the game saves them, not part of the game.
+        return {'wave_size': self.wave_size, 'wave_growth': self.wave_growth,
+                'max_wave_size': self.max_wave_size, 'spawn_interval': self.generate_enemies_interval,
+                'fan_out': self.fan_out, 'immortal': self.immortal}
+
+    def get_wave_size(self):
+        return min(self.wave_size + self.wave_growth * (self.game_round - 1), self.max_wave_size)
+
+    def begin_next_round(self):
+        """Close the statistics of the cleared wave before the next round begins."""
+        if self.game_begin and not (self.show_round_text or self.generate_enemies) and len(self.enemies) == 0:
+            self.end_wave()
+        super().begin_next_round()
+
+    def end_wave(self):
+        """Keep the statistics of the current wave and save all waves so far."""
+        summary = self.wave_stats.end(knights=self.generation_amount, spawn_interval=self.generate_enemies_interval,
+                                      fan_out=self.fan_out, pool=self.knight_pool.stats())
+        if summary is not None and self.stats_path is not None:
+            save_json(self.stats_path, self.wave_stats.waves)
+
+    def start_wave(self):
+        super().start_wave()
+        self.wave_stats.begin(self.game_round)
+
+    def spawn_enemies(self):
+        """Spawn fan_out knights, each at a different spawn point if there are enough."""
+        amount = min(self.fan_out, self.generation_amount -
+                     self.enemy_generation_counter)
+        points = sample(self.knights_pos, min(amount, len(self.knights_pos)))
+        for i in range(amount):
+            x, y = points[i % len(points)]
+            if self.game_round <= 2:
+                self.knight_pool.acquire('01', x, y, randint(30, 40), 1)
+            elif self.game_round <= 6:
+                self.knight_pool.acquire('02', x, y, randint(40, 60), 2)
+            else:
+                self.knight_pool.acquire('03', x, y, randint(60, 80), 3)
+        self.enemy_generation_counter += amount
+        self.detect_wave_complete()
+
+    def show_exit_selection_box(self):
+        """Heal the immortal player, otherwise save the statistics and show the selection box."""
+        if self.immortal:
+            self.player.hv = 5
+            return
+        self.end_wave()
+        super().show_exit_selection_box()
+
+    def simulate(self, frame_time):
+        # The frame time is measured from the simulation to the end of draw().
+        self.frame_begin = time.perf_counter()
+        return super().simulate(frame_time)
+
+    def draw(self):
+        super().draw()
+        self.wave_stats.add((time.perf_counter() - self.frame_begin) * 1000,
+                            len(self.enemies))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import heapq
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class Timer:
+    """A callback registered in a scheduler. interval is None for a one-shot timer."""
+
+    def __init__(self, due, interval, callback, args) -> None:
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop the timer. It's dropped by the scheduler the next time it's due."""
+        self.cancelled = True
+
+    @property
+    def active(self):
+        return not self.cancelled
+
+
+class Scheduler:
+    """One-shot and repeating callbacks on the clock of a scene or a menu.
+       The timers are kept in a heap by their due time, so update() only touches the expired ones.
+       self.time is the clock of the scheduler(ms). It follows the time passed to update(),
+       multiplied by time_scale, and stands still while the scheduler is paused."""
+
+    def __init__(self, time_scale=1) -> None:
+        self.heap = []  # (due, order, timer)
+        self.order = 0  # It keeps the timers due at the same time in the order they were added.
+        self.time = 0
+        self.last_now = None
+        self.time_scale = time_scale
+        self.paused = False
+
+    def after(self, delay, callback, *args):
+        """Call callback(*args) once after delay(ms). Return the timer."""
+        return self.push(Timer(self.time + delay, None, callback, args))
+
+    def every(self, interval, callback, *args, delay=None):
+        """Call callback(*args) every interval(ms), first after delay(the interval by default).
+            The next call is counted from the time the timer is fired. Return the timer."""
+        interval = max(interval, 1)  # A timer can't fire more than once a millisecond.
+        if delay is None:
+            delay = interval
+        return self.push(Timer(self.time + delay, interval, callback, args))
+
+    def push(self, timer):
+        heapq.heappush(self.heap, (timer.due, self.order, timer))
+        self.order += 1
+        return timer
+
+    def cancel(self, timer):
+        if timer is not None:
+            timer.cancel()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def update(self, now):
+        """Advance the clock to now(ms, usually pg.time.get_ticks()) and fire the expired timers.
+            Return the time of the scheduler."""
+        if self.last_now is not None and not self.paused:
+            self.time += (now - self.last_now) * self.time_scale
+        self.last_now = now
+        heap = self.heap
+        while heap and heap[0][0] <= self.time:
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+            if timer.interval is None:
+                timer.cancelled = True  # A fired one-shot timer is done.
+            timer.callback(*timer.args)
+            if timer.interval is not None and not timer.cancelled:
+                timer.due = self.time + timer.interval
+                self.push(timer)
+        return self.time
+
+    def clear(self):
+        for _, _, timer in self.heap:
+            timer.cancel()
+        self.heap = []
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self.heap if not timer.cancelled)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+import argparse
+import random
+import time
+import constants as c
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+def soak(control, rounds, seed, render, bot=False):
+    """Play rounds of the infinite mode on a virtual clock. The player can't die and the knights
+        are slain as they are spawned, so the rounds go on as fast as the CPU allows.
+        With bot, the bot player fights the knights and only the ones it gives up are slain.
+        Return the statistics of the run."""
+    from scenes import InfiniteModeCliff
+    from clocks import VirtualClock
+    glo = control.glo
+    glo.next_scene = ['infinite_mode_cliff', 'player01']
+    if bot:
+        from controllers import BotController
+        glo.controller = BotController
+    random.seed(seed)
+    scene = InfiniteModeCliff(control.clock, control.screen, glo.display, glo, 1.5)
+    scene.load_data(c.INFINITEMODECLIFF)
+    scene.new()
+    scene.particles.seed(seed)
+    # The longest frame the simulation takes, drawn once if the rendering is on.
+    scene.frame_clock = VirtualClock(c.MAXFRAMETIME)
+    scene.render = render
+    scene.player.rect.center = scene.enter_rects['game_begin'].center
+    begin = time.perf_counter()
+    while scene.game_round <= rounds:
+        scene.run_frame()
+        # The selection box after death waits for the keyboard, so the player can't die.
+        scene.player.hv = 5
+        if bot:
+            for knight in scene.controller.given_up:
+                knight.hv = 0
+        else:
+            scene.enemy_manager.hv[:] = 0
+    elapsed = time.perf_counter() - begin
+    return {'rounds': rounds, 'steps': scene.sim.steps, 'simulated': scene.sim.ticks / 1000,
+            'elapsed': elapsed, 'speed': scene.sim.ticks / 1000 / elapsed,
+            'knight_pool': scene.knight_pool.stats(),
+            'particles_high_water': scene.particles.high_water}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Soak test the rounds of the infinite mode faster than realtime.')
+    parser.add_argument('--rounds', type=int, default=c.SOAKROUNDS,
+                        help='the rounds to play')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='the seed of the random spawns and particles')
+    parser.add_argument('--render', action='store_true',
+                        help='draw the frames offscreen')
+    parser.add_argument('--bot', action='store_true',
+                        help='let the bot player fight the knights')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    import pygame as pg
+    from tools import headless_control
+    control = headless_control()
+    result = soak(control, args.rounds, args.seed, args.render, args.bot)
+    print('%(rounds)d rounds, %(steps)d steps, %(simulated).1f s simulated in %(elapsed).1f s '
+          '(%(speed).0fx realtime)' % result)
+    print('knight pool: %(knight_pool)s, particle high water: %(particles_high_water)d' % result)
+    pg.quit()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+import pygame as pg
+import constants as c
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+class Bus:
+    """A named volume shared by a group of sounds."""
+
+    def __init__(self, name, volume) -> None:
+        self.name = name
+        self.volume = volume
+
+
+class SoundHandle:
+    """A shared sound played on a bus.
+       The volume of the channel is set when the sound is played, so changing the bus volume
+       never touches the sounds."""
+
+    def __init__(self, sound, bus, gain=1) -> None:
+        self.sound = sound
+        self.bus = bus
+        self.gain = gain  # relative to the bus volume
+
+    def play(self, loops=0, maxtime=0, fade_ms=0):
+        channel = self.sound.play(loops, maxtime, fade_ms)
+        if channel is not None:
+            channel.set_volume(min(1, self.bus.volume * self.gain))
+        return channel
+
+
+class SoundBank:
+    """Each sound file is decoded once and shared by every handle of it.
+       Handles are keyed by (path, bus, gain), so all sprites of a type share the same handles."""
+
+    def __init__(self) -> None:
+        self.buses = {'sfx': Bus('sfx', c.sound_volume),
+                      'ui': Bus('ui', c.sound_volume),
+                      'bgm': Bus('bgm', c.bgm_volume)}
+        self.sounds = {}  # path: pg.mixer.Sound
+        self.handles = {}  # (path, bus, gain): SoundHandle
+        self.music_enabled = True  # If it's false, the bgm is neither loaded nor played.
+
+    def sound(self, path, bus='sfx', gain=1):
+        """Get the handle of the sound on the bus."""
+        key = (path, bus, gain)
+        handle = self.handles.get(key)
+        if handle is None:
+            sound = self.sounds.get(path)
+            if sound is None:
+                sound = pg.mixer.Sound(path)
+                self.sounds[path] = sound
+            handle = SoundHandle(sound, self.buses[bus], gain)
+            self.handles[key] = handle
+        return handle
+
+    def volume(self, bus):
+        return self.buses[bus].volume
+
+    def set_volume(self, bus, volume):
+        """Set the volume of the bus. The volume of the bgm bus is applied to the music at once."""
+        self.buses[bus].volume = volume
+        if bus == 'bgm':
+            pg.mixer.music.set_volume(volume)
+
+    def load_music(self, path):
+        """Load the bgm and set its volume to the bgm bus."""
+        if self.music_enabled:
+            pg.mixer.music.load(path)
+            pg.mixer.music.set_volume(self.buses['bgm'].volume)
+
+    def play_music(self, loops=-1, fade_ms=0):
+        if self.music_enabled:
+            pg.mixer.music.play(loops=loops, fade_ms=fade_ms)
+
+
+sounds = SoundBank()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+import json
+import numpy as np
+
+
+__author__ = 'Geoff Yulong Li'
+
+
+def summarize(samples):
+    """Get the statistics of the samples(ms): count, mean, p50, p95, p99 and max."""
+    if len(samples) == 0:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    a = np.asarray(samples, dtype=float)
+    p50, p95, p99 = np.percentile(a, (50, 95, 99))
+    return {'count': len(a), 'mean': round(float(a.mean()), 3), 'p50': round(float(p50), 3),
+            'p95': round(float(p95), 3), 'p99': round(float(p99), 3), 'max': round(float(a.max()), 3)}
+
+
+def save_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+class WaveStats:
+    """Frame times grouped by waves of enemies.
+       begin() starts a wave, add() records the time of a frame(ms) and the enemy amount,
+       end() closes the wave and keeps its summary in self.waves."""
+
+    def __init__(self) -> None:
+        self.waves = []
+        self.wave = None  # the number of the current wave
+        self.frame_times = []
+        self.peak_enemies = 0
+
+    def begin(self, wave):
+        self.wave = wave
+        self.frame_times = []
+        self.peak_enemies = 0
+
+    def add(self, frame_time, enemies):
+        if self.wave is not None:
+            self.frame_times.append(frame_time)
+            self.peak_enemies = max(self.peak_enemies, enemies)
+
+    def end(self, **extra):
+        """Close the current wave. extra is stored with the summary. Return the summary or None."""
+        if self.wave is None:
+            return None
+        summary = {'wave': self.wave, 'peak_enemies': self.peak_enemies}
+        summary.update(summarize(self.frame_times))
+        summary.update(extra)
+        self.waves.append(summary)
+        self.wave = None
+        return summary
@@ -1,10 +1,49 @@
 #!/usr/bin/env python
+import argparse
+import constants as c
 from tools import Control
 
 
 __author__ = 'Geoff Yulong Li'
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=c.TITLE)
+    # Run with --scaled to let the SDL renderer scale the game screen.
+    parser.add_argument('--scaled', action='store_true',
+                        help='let the SDL renderer scale the game screen')
+    # Run with --horde to go straight to the horde stress mode after the loading menu.
+    parser.add_argument('--horde', action='store_true',
+                        help='play the horde stress mode of the infinite mode')
+    parser.add_argument('--wave-size', type=int, default=c.HORDEWAVESIZE,
+                        help='the knights of the first wave')
+    parser.add_argument('--wave-growth', type=int, default=c.HORDEWAVEGROWTH,
+                        help='the knights added every wave')
+    parser.add_argument('--max-wave-size', type=int, default=c.HORDEMAXWAVESIZE,
+                        help='the most knights of a wave')
+    parser.add_argument('--spawn-interval', type=int, default=c.HORDESPAWNINTERVAL,
+                        help='the time between spawns (ms)')
+    parser.add_argument('--fan-out', type=int, default=c.HORDEFANOUT,
+                        help='the spawn points used by each spawn')
+    parser.add_argument('--stats', default=c.HORDESTATSPATH,
+                        help='where the frame time statistics of the waves are saved')
+    parser.add_argument('--immortal', action='store_true',
+                        help='heal the player instead of ending the game')
+    # Run with --record to write the input of the battle scenes to a log for replay.py.
+    parser.add_argument('--record', metavar='PATH',
+                        help='record the input of the battle scenes to the file')
+    # Run with --bot to watch the bot player play the battle scenes.
+    parser.add_argument('--bot', action='store_true',
+                        help='let the bot player play the battle scenes')
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
-    c = Control()
-    c.main()
+    args = parse_args()
+    horde = {'wave_size': args.wave_size, 'wave_growth': args.wave_growth,
+             'max_wave_size': args.max_wave_size, 'spawn_interval': args.spawn_interval,
+             'fan_out': args.fan_out, 'stats_path': args.stats, 'immortal': args.immortal}
+    control = Control('scaled' if args.scaled else 'software',
+                      ['horde_mode_cliff', 'player01'] if args.horde else None, horde, args.record,
+                      args.bot)
+    control.main()
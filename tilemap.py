@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 import pygame as pg
 from constants import *
+import numpy as np
 import pytmx
+from physics import per_step
 
 
 __author__ = 'Geoff Yulong Li'
@@ -42,6 +44,26 @@ class TiledMap:
                         surface.blit(
                             tile, (x * self.tmxdata.tilewidth, y * self.tmxdata.tileheight))
 
+    def render_area(self, surface, tx, ty, tw, th):
+        """Blit the tiles inside the area (in tiles) to the surface.
+            The top left tile of the area is blitted at (0, 0).
+            Return True if at least one tile has been blitted."""
+        ti = self.tmxdata.get_tile_image_by_gid
+        tile_w = self.tmxdata.tilewidth
+        tile_h = self.tmxdata.tileheight
+        blitted = False
+        for layer in self.tmxdata.visible_layers:
+            if isinstance(layer, pytmx.TiledTileLayer):
+                for y in range(ty, min(ty + th, layer.height)):
+                    row = layer.data[y]
+                    for x in range(tx, min(tx + tw, layer.width)):
+                        tile = ti(row[x])
+                        if tile:
+                            surface.blit(
+                                tile, ((x - tx) * tile_w, (y - ty) * tile_h))
+                            blitted = True
+        return blitted
+
     def make_map(self):
         """Create the surface of the tiled map."""
         # Create a surface the same size of the tiled map.
@@ -51,6 +73,159 @@ class TiledMap:
         return temp_surface
 
 
+class ChunkedMap:
+    """The tiled map split into pre-rendered chunks of CHUNKSIZE x CHUNKSIZE tiles.
+       Only the chunks overlapping the camera are blitted, so the cost of drawing
+       the map doesn't depend on the size of the map."""
+
+    def __init__(self, tiled_map, size_multiplier, colorkey=None) -> None:
+        self.size_multiplier = size_multiplier
+        tm = tiled_map.tmxdata
+        self.cols = -(-tm.width // CHUNKSIZE)  # ceil
+        self.rows = -(-tm.height // CHUNKSIZE)
+        # the size of the map before and after scaling
+        self.map_width = tiled_map.width
+        self.map_height = tiled_map.height
+        self.width = int(tiled_map.width * size_multiplier)
+        self.height = int(tiled_map.height * size_multiplier)
+        self.rect = pg.Rect(0, 0, self.width, self.height)
+        # the size of one chunk on the scaled map
+        self.chunk_width = CHUNKSIZE * tm.tilewidth * size_multiplier
+        self.chunk_height = CHUNKSIZE * tm.tileheight * size_multiplier
+        # chunks[row][col] is (surface, rect) or None if the chunk is empty.
+        self.chunks = []
+        temp_surface = pg.Surface(
+            (CHUNKSIZE * tm.tilewidth, CHUNKSIZE * tm.tileheight))
+        for row in range(self.rows):
+            chunk_row = []
+            for col in range(self.cols):
+                temp_surface.fill(BLACK)
+                if tiled_map.render_area(temp_surface, col * CHUNKSIZE, row * CHUNKSIZE, CHUNKSIZE, CHUNKSIZE):
+                    chunk_row.append(self.make_chunk(
+                        temp_surface, col, row, colorkey))
+                else:
+                    chunk_row.append(None)
+            self.chunks.append(chunk_row)
+
+    def make_chunk(self, temp_surface, col, row, colorkey):
+        """Scale the rendered chunk and get its rect on the scaled map.
+            The edges are rounded the same way as the scaled full map, so chunks never overlap or leave gaps."""
+        left = int(col * self.chunk_width)
+        top = int(row * self.chunk_height)
+        right = min(int((col + 1) * self.chunk_width), self.width)
+        bottom = min(int((row + 1) * self.chunk_height), self.height)
+        rect = pg.Rect(left, top, right - left, bottom - top)
+        # Crop the chunk if it's at the right or bottom edge of the map.
+        area = temp_surface.get_rect()
+        area.width = min(area.width, self.map_width - col * area.width)
+        area.height = min(area.height, self.map_height - row * area.height)
+        surf = pg.transform.scale(
+            temp_surface.subsurface(area), rect.size).convert()
+        if colorkey is not None:
+            surf.set_colorkey(colorkey, pg.RLEACCEL)
+        return surf, rect
+
+    def draw(self, surface, camera):
+        """Blit the chunks that can be seen by the camera."""
+        view = pg.Rect(-camera.x, -camera.y, surface.get_width(),
+                       surface.get_height())
+        first_col = max(0, int(view.left // self.chunk_width))
+        last_col = min(self.cols - 1, int(view.right // self.chunk_width))
+        first_row = max(0, int(view.top // self.chunk_height))
+        last_row = min(self.rows - 1, int(view.bottom // self.chunk_height))
+        for row in range(first_row, last_row + 1):
+            chunk_row = self.chunks[row]
+            for col in range(first_col, last_col + 1):
+                chunk = chunk_row[col]
+                if chunk is not None:
+                    surface.blit(chunk[0], camera.apply_rect(chunk[1]))
+
+
+class CollisionGrid:
+    """A uniform grid over the rects of a group of static sprites(walls).
+       Every rect is listed in the cells it overlaps, so a query only tests the rects
+       of the few cells around the queried rect. The sprites must not move after the grid is built."""
+
+    def __init__(self, group, cell_size=COLLISIONCELLSIZE) -> None:
+        self.cell_size = cell_size
+        # The rects are kept in the order of the group like spritecollide.
+        self.rects = [sprite.rect.copy() for sprite in group]
+        self.cells = {}  # (col, row): indices of the rects
+        for i, rect in enumerate(self.rects):
+            for cell in self.cells_of(rect):
+                self.cells.setdefault(cell, []).append(i)
+        self.make_table()
+
+    def make_table(self):
+        """Copy the grid to arrays for batch queries.
+            self.edges[i] is (left, top, right, bottom) of rect i. The last row is an empty rect
+            that never overlaps anything. self.table[row, col] lists the rects of the cell, padded
+            with the index of the empty rect."""
+        self.edges = np.array([(r.left, r.top, r.right, r.bottom) for r in self.rects] +
+                              [(0, 0, 0, 0)], dtype=np.int64)
+        empty = len(self.rects)
+        if self.cells:
+            self.origin = (min(col for col, _ in self.cells),
+                           min(row for _, row in self.cells))
+            cols = max(col for col, _ in self.cells) - self.origin[0] + 1
+            rows = max(row for _, row in self.cells) - self.origin[1] + 1
+            depth = max(len(indices) for indices in self.cells.values())
+        else:
+            self.origin, cols, rows, depth = (0, 0), 1, 1, 1
+        self.table = np.full((rows, cols, depth), empty, dtype=np.int64)
+        for (col, row), indices in self.cells.items():
+            self.table[row - self.origin[1], col -
+                       self.origin[0], :len(indices)] = indices
+
+    def cells_of(self, rect):
+        """Get the cells the rect overlaps."""
+        cs = self.cell_size
+        for row in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+            for col in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                yield col, row
+
+    def collide(self, rect):
+        """Get the first rect that overlaps the rect, or None."""
+        first = None
+        cells = self.cells
+        rects = self.rects
+        for cell in self.cells_of(rect):
+            for i in cells.get(cell, ()):
+                if (first is None or i < first) and rect.colliderect(rects[i]):
+                    first = i
+        return None if first is None else rects[first]
+
+    def first_hits(self, left, top, right, bottom):
+        """Batch version of collide(). The rects are given as integer arrays of their edges.
+            Return the index of the first overlapped rect of each rect, or -1."""
+        cs = self.cell_size
+        empty = len(self.rects)
+        rows, cols, _ = self.table.shape
+        c0 = left // cs - self.origin[0]
+        c1 = (right - 1) // cs - self.origin[0]
+        r0 = top // cs - self.origin[1]
+        r1 = (bottom - 1) // cs - self.origin[1]
+        # the cells around each rect, as many as the largest rect needs
+        span_x = int((c1 - c0).max(initial=0)) + 1
+        span_y = int((r1 - r0).max(initial=0)) + 1
+        col = c0[:, None] + np.arange(span_x)
+        row = r0[:, None] + np.arange(span_y)
+        valid = (((col <= c1[:, None]) & (col >= 0) & (col < cols))[:, None, :] &
+                 ((row <= r1[:, None]) & (row >= 0) & (row < rows))[:, :, None])
+        candidates = self.table[np.clip(row, 0, rows - 1)[:, :, None],
+                                np.clip(col, 0, cols - 1)[:, None, :]]
+        candidates = np.where(valid[..., None], candidates,
+                              empty).reshape(len(left), -1)
+        edges = self.edges[candidates]
+        overlap = ((left[:, None] < edges[..., 2]) & (right[:, None] > edges[..., 0]) &
+                   (top[:, None] < edges[..., 3]) & (bottom[:, None] > edges[..., 1]))
+        first = np.where(overlap, candidates, empty).min(axis=1, initial=empty)
+        return np.where(first < empty, first, -1)
+
+    def __len__(self):
+        return len(self.rects)
+
+
 class Camera:
     def __init__(self, width, height) -> None:
         self.camera = pg.Rect(0, 0, width, height)
@@ -82,12 +257,13 @@ class Camera:
         self.x = max(-(self.width - SCREENWIDTH), self.x)  # right
         self.y = max(-(self.height - SCREENHEIGHT), self.y)  # bottom
 
-    def delayed_update(self, target):
-        """Follow the target sprite and make a little lag."""
-        self.x += (int(SCREENWIDTH / 2) - target.rect.x -
-                   target.rect.width - self.x) / 20
-        self.y += (int(SCREENHEIGHT * 2 / 3) - target.rect.y -
-                   target.rect.height - self.y) / 20
+    def delayed_update(self, rect, dt=1 / 60):
+        """Follow the rect and make a little lag. dt is the time since the last update(s)."""
+        rate = per_step(1 / 20, dt)
+        self.x += (int(SCREENWIDTH / 2) - rect.x -
+                   rect.width - self.x) * rate
+        self.y += (int(SCREENHEIGHT * 2 / 3) - rect.y -
+                   rect.height - self.y) * rate
         # limit scrolling to map size
         self.x = min(0, self.x)  # left
         self.y = min(0, self.y)  # top
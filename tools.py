@@ -1,18 +1,35 @@
 #!/usr/bin/env python
+import os
 import pygame as pg
 from constants import *
 from scenes import *
 from menus import *
-from globals import Global
+from globals import Global, Archive
+from sounds import sounds
+from replay import InputRecorder
+from controllers import BotController
 
 
 __author__ = 'Geoff Yulong Li'
 
 next_scene = ['outside', 'player01']
+# the battle scenes by their names in glo.next_scene: (scene class, map)
+SCENES = {'cliff': (Cliff, CLIFF), 'string_star': (StringStar, STRINGSTAR),
+          'infinite_mode_cliff': (InfiniteModeCliff, INFINITEMODECLIFF),
+          'horde_mode_cliff': (HordeModeCliff, INFINITEMODECLIFF)}
+# the levels of the game, the battle scenes besides the horde stress mode
+LEVELS = ('cliff', 'string_star', 'infinite_mode_cliff')
 
 
 class Control:
-    def __init__(self) -> None:
+    def __init__(self, presenter='software', first_scene=None, horde=None, record=None,
+                 bot=False) -> None:
+        self.presenter = presenter  # 'software' or 'scaled'
+        # the scene after the loading menu, the main menu by default
+        self.first_scene = first_scene or ['main_menu', 'press_key']
+        self.horde = horde or {}  # the settings of the horde mode
+        self.record = record  # where the input of the battle scenes is recorded
+        self.bot = bot  # the bot plays the battle scenes instead of the keyboard
         self.clock = None
         self.screen = None
         self.pressed_keys = None
@@ -30,7 +47,11 @@ class Control:
         pg.mouse.set_visible(False)
 
     def global_init(self):
-        self.glo = Global()
+        self.glo = Global(self.presenter)
+        if self.record is not None:
+            self.glo.input = InputRecorder(self.record)
+        if self.bot:
+            self.glo.controller = BotController
 
     def main(self):
         """The main skeleton of the game process."""
@@ -40,7 +61,7 @@ class Control:
         loading_menu = LoadingMenu(
             self.clock, self.screen, self.display, self.glo)
         loading_menu.main()
-        self.glo.next_scene = ['main_menu', 'press_key']
+        self.glo.next_scene = self.first_scene
         while True:
             if self.glo.next_scene[0] == 'main_menu':
                 self.detect_has_loaded_archive()
@@ -80,6 +101,11 @@ class Control:
                 infinite_mode = InfiniteModeCliff(
                     self.clock, self.screen, self.display, self.glo, 1.5)
                 infinite_mode.main()
+            elif self.glo.next_scene[0] == 'horde_mode_cliff':
+                self.glo.ready_to_play_menu_bgm = True
+                horde_mode = HordeModeCliff(
+                    self.clock, self.screen, self.display, self.glo, 1.5, **self.horde)
+                horde_mode.main()
 
     def auto_save(self):
         """Save the game automatically."""
@@ -96,3 +122,18 @@ class Control:
             self.glo.has_loaded_archive = True
         else:
             self.glo.has_loaded_archive = False
+
+
+def headless_control(window=False):
+    """Get a game control for the tools that run scenes without the menus: no sound card,
+        no bgm and every scene unlocked. Without window, nothing is shown either."""
+    # SDL reads the drivers when it's initialized by global_init.
+    if not window:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    sounds.music_enabled = False
+    control = Control()
+    control.global_init()
+    control.pygame_init()
+    control.glo.archive = Archive([True, True, True])
+    return control